@@ -3,7 +3,10 @@
 # AUTOMATES THE IMPORT PROCESS FOR sched-ext/scx.
 #
 # USAGE:
-#   ./export_scx.py /path/to/scx
+#   ./export_scx.py [--wait-fmt] /path/to/scx
+#
+#   cargo fmt RUNS DETACHED IN THE BACKGROUND BY DEFAULT; --wait-fmt BLOCKS
+#   ON IT AND REPORTS ITS RESULT.
 #
 # WHAT IT DOES:
 #   1. COPIES SOURCE FILES INTO scheds/rust/scx_pandemonium/
@@ -20,15 +23,54 @@
 #   - DOES NOT COMMIT OR PUSH ANYTHING
 #   - DOES NOT MODIFY Cargo.lock (RUN cargo update AFTER)
 
+import bisect
+import errno
+import io
 import os
 import re
 import shutil
+import stat
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 CRATE_OLD = "pandemonium"
 CRATE_NEW = "scx_pandemonium"
 DEST_REL = os.path.join("scheds", "rust", CRATE_NEW)
+_CRATE_OLD_BYTES = CRATE_OLD.encode()
+_DEST_REL_BYTES = DEST_REL.encode()
+
+# EXPORTED FILES ARE EDITED AS bytes: EVERY TOKEN BELOW IS ASCII, SO NOTHING
+# IS DECODED OR RE-ENCODED ON THE WAY THROUGH
+
+# CRATE PATH REWRITES IN .rs FILES, APPLIED IN ONE SCAN PER FILE
+_RENAME_MAP = {
+    f"use {CRATE_OLD}::".encode(): f"use {CRATE_NEW}::".encode(),
+    f"extern crate {CRATE_OLD}".encode(): f"extern crate {CRATE_NEW}".encode(),
+    f"from {CRATE_OLD}::tuning".encode(): f"from {CRATE_NEW}::tuning".encode(),
+}
+# ONE ALTERNATION BUILT FROM THE MAP KEYS: A SINGLE LINEAR SCAN PER FILE NO
+# MATTER HOW MANY REWRITES ARE ADDED. LONGEST KEY FIRST SO A KEY THAT PREFIXES
+# ANOTHER CAN NEVER SHADOW IT.
+_RENAME_RE = re.compile(
+    rb"\b(" + b"|".join(map(re.escape, sorted(_RENAME_MAP, key=len, reverse=True))) + rb")"
+)
+
+# MANIFEST PATTERNS, COMPILED ONCE AT IMPORT
+# [profile.release] AND ALL FOLLOWING key=value LINES UNTIL NEXT SECTION OR EOF
+_PROFILE_RE = re.compile(rb'\n\[profile\.release\]\n(?:[^\[]*)')
+_VERSION_RE = re.compile(rb'^version\s*=\s*"([^"]+)"', re.MULTILINE)
+_LIBBPF_CARGO_RE = re.compile(rb'libbpf-cargo\s*=\s*"[^"]*"')
+_LIBBPF_NO_DEFAULTS_RE = re.compile(
+    rb'(libbpf-rs\s*=\s*\{[^}]*),\s*default-features\s*=\s*false'
+)
+
+# ONE QUOTED ENTRY PER LINE IN THE WORKSPACE members ARRAY
+_MEMBER_RE = re.compile(r'\s*"([^"]+)",?\s*$')
+# THE "members = [" OPENER ON A LINE OF ITS OWN; LINE-ANCHORED SO IT CANNOT
+# MATCH INSIDE "default-members = ["
+_MEMBERS_OPEN_RE = re.compile(r'(?m)^[ \t]*members = \[[ \t]*\r?\n')
 
 # FILES TO COPY (RELATIVE TO PANDEMONIUM ROOT)
 # MATCHES WHAT PIOTR IMPORTED IN HIS pandemonium-import BRANCH
@@ -56,6 +98,78 @@ EXCLUDE = {
     "export_scx.py",
     "Cargo.lock",
 }
+# EXCLUDE HOLDS PLAIN NAMES, NO GLOBS: A FROZENSET LOOKUP REPLACES fnmatch
+_EXCLUDE_SET = frozenset(EXCLUDE)
+
+# PER-FILE COPIES ARE SYSCALL-BOUND AND RELEASE THE GIL, SO OVERSUBSCRIBE CORES
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# copy_file_range ERRORS THAT MEAN "NOT SUPPORTED HERE", NOT "COPY FAILED"
+_CFR_FALLBACK_ERRNOS = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP}
+
+
+def _fast_copy(src, dst, st=None):
+    """Copy src to dst (with mode and timestamps), keeping file data in the kernel.
+
+    Uses copy_file_range (Linux >= 5.3) so no userspace buffer is touched,
+    falling back to shutil.copyfile (sendfile on Linux). If st is given it is
+    the source's already-cached stat (e.g. from os.DirEntry) and is applied
+    directly rather than letting copystat stat the source a second time.
+    """
+    copied = False
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                    pass
+            copied = True
+        except OSError as e:
+            if e.errno not in _CFR_FALLBACK_ERRNOS:
+                raise
+    if not copied:
+        shutil.copyfile(src, dst)
+
+    if st is None:
+        shutil.copystat(src, dst)
+    else:
+        os.chmod(dst, stat.S_IMODE(st.st_mode))
+        os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _scan_copy_jobs(src, dst, exclude, jobs):
+    """Walk src with os.scandir, mirroring directories under dst.
+
+    Entries whose name is in exclude are skipped. Appends (src_file,
+    dst_file, stat) to jobs. The stat comes from the DirEntry cache, so each
+    source file is stat'd at most once.
+    """
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as it:
+        for entry in it:
+            if entry.name in exclude:
+                continue
+            out = os.path.join(dst, entry.name)
+            if entry.is_dir():
+                _scan_copy_jobs(entry.path, out, exclude, jobs)
+            else:
+                jobs.append((entry.path, out, entry.stat()))
+
+
+def _parallel_copytree(src, dst, exclude):
+    """Copy directory src to dst, fanning per-file copies out to a thread pool.
+
+    Directories are created up front in a single scandir walk; files are then
+    copied concurrently. Returns (files copied, bytes copied), both tallied
+    from the walk's cached stats rather than a second pass over dst.
+    """
+    jobs = []
+    _scan_copy_jobs(src, dst, exclude, jobs)
+
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+        # list() DRAINS THE ITERATOR SO WORKER EXCEPTIONS PROPAGATE
+        list(pool.map(lambda job: _fast_copy(*job), jobs))
+    return len(jobs), sum(st.st_size for _, _, st in jobs)
+
 
 def copy_tree(src_root, dst_root):
     """Copy INCLUDE paths from src_root to dst_root, skipping EXCLUDE."""
@@ -71,76 +185,116 @@ def copy_tree(src_root, dst_root):
         if os.path.isdir(src):
             if os.path.exists(dst):
                 shutil.rmtree(dst)
-            shutil.copytree(src, dst, ignore=shutil.ignore_patterns(*EXCLUDE))
-            count = sum(len(files) for _, _, files in os.walk(dst))
-            print(f"  COPY DIR: {entry} ({count} files)")
+            count, nbytes = _parallel_copytree(src, dst, _EXCLUDE_SET)
+            print(f"  COPY DIR: {entry} ({count} files, {nbytes // 1024} KB)")
             copied += count
         else:
             os.makedirs(os.path.dirname(dst), exist_ok=True)
-            shutil.copy2(src, dst)
+            _fast_copy(src, dst)
             print(f"  COPY: {entry}")
             copied += 1
 
     return copied
 
 
-def rename_crate(dst_root):
-    """Rename pandemonium -> scx_pandemonium in Cargo.toml and .rs files."""
+def _rewrite_one(fpath):
+    """Apply the crate path rewrites to one .rs file. Returns True if rewritten.
+
+    The new content goes to a temp file that is renamed over the original,
+    so a failed write never leaves a truncated source file behind.
+    """
+    data = Path(fpath).read_bytes()
+    # MOST FILES NEVER NAME THE CRATE: A memmem SCAN SKIPS THE REGEX
+    if _CRATE_OLD_BYTES not in data:
+        return False
+    new_data, n = _RENAME_RE.subn(lambda m: _RENAME_MAP[m.group(0)], data)
+    if not n:
+        return False
+    tmp = fpath + ".tmp"
+    Path(tmp).write_bytes(new_data)
+    shutil.copymode(fpath, tmp)
+    os.replace(tmp, fpath)
+    return True
+
+
+def _apply_edits(data, edits):
+    """Apply (start, end, replacement) spans to data in one pass.
+
+    Spans are offsets into the original data and must not overlap. Unchanged
+    stretches are written straight out of a memoryview, so the output buffer
+    is the only copy made no matter how many edits there are.
+    """
+    mv = memoryview(data)
+    out = io.BytesIO()
+    prev = 0
+    for start, end, repl in sorted(edits):
+        if start < prev:
+            raise ValueError(f"overlapping Cargo.toml edits at byte {start}")
+        out.write(mv[prev:start])
+        out.write(repl)
+        prev = end
+    out.write(mv[prev:])
+    return out.getvalue()
+
+
+def rename_crate(dst_root, cargo):
+    """Rename pandemonium -> scx_pandemonium in Cargo.toml and .rs files.
+
+    The .rs files are rewritten in place. Cargo.toml is not modified here:
+    returns (edits, number of changes), where edits are (start, end,
+    replacement) spans against cargo for _apply_edits.
+    """
     changes = 0
+    edits = []
 
     # Cargo.toml: package name
-    cargo_path = os.path.join(dst_root, "Cargo.toml")
-    if os.path.exists(cargo_path):
-        text = open(cargo_path).read()
-        new_text = text.replace(
-            f'name = "{CRATE_OLD}"',
-            f'name = "{CRATE_NEW}"',
-        )
-        if new_text != text:
-            open(cargo_path, "w").write(new_text)
-            print(f"  RENAME: Cargo.toml package name -> {CRATE_NEW}")
-            changes += 1
+    old_name = f'name = "{CRATE_OLD}"'.encode()
+    new_name = f'name = "{CRATE_NEW}"'.encode()
+    start = cargo.find(old_name)
+    while start != -1:
+        edits.append((start, start + len(old_name), new_name))
+        start = cargo.find(old_name, start + len(old_name))
+    if edits:
+        print(f"  RENAME: Cargo.toml package name -> {CRATE_NEW}")
+        changes += 1
 
     # .rs files: use pandemonium:: -> use scx_pandemonium::
-    for dirpath, _, filenames in os.walk(dst_root):
-        for fname in filenames:
-            if not fname.endswith(".rs"):
-                continue
-            fpath = os.path.join(dirpath, fname)
-            text = open(fpath).read()
-            new_text = text.replace(
-                f"use {CRATE_OLD}::",
-                f"use {CRATE_NEW}::",
-            ).replace(
-                f"extern crate {CRATE_OLD}",
-                f"extern crate {CRATE_NEW}",
-            ).replace(
-                f"from {CRATE_OLD}::tuning",
-                f"from {CRATE_NEW}::tuning",
-            )
-            if new_text != text:
-                open(fpath, "w").write(new_text)
-                rel = os.path.relpath(fpath, dst_root)
-                print(f"  RENAME: {rel}")
-                changes += 1
-
-    return changes
-
-
-def strip_profile_release(dst_root):
-    """Remove [profile.release] block from Cargo.toml."""
-    cargo_path = os.path.join(dst_root, "Cargo.toml")
-    text = open(cargo_path).read()
-
-    # Remove [profile.release] and all following key=value lines until next section or EOF
-    pattern = r'\n\[profile\.release\]\n(?:[^\[]*)'
-    new_text = re.sub(pattern, '\n', text)
-
-    if new_text != text:
-        open(cargo_path, "w").write(new_text.rstrip() + "\n")
-        print("  STRIP: [profile.release] (workspace provides its own)")
-        return 1
-    return 0
+    rs_paths = [
+        os.path.join(dirpath, fname)
+        for dirpath, _, filenames in os.walk(dst_root)
+        for fname in filenames
+        if fname.endswith(".rs")
+    ]
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        results = list(pool.map(_rewrite_one, rs_paths))
+
+    # REPORT IN WALK ORDER FROM THE MAIN THREAD, NOT AS WORKERS FINISH
+    for fpath, rewritten in zip(rs_paths, results):
+        if rewritten:
+            print(f"  RENAME: {os.path.relpath(fpath, dst_root)}")
+    return edits, changes + sum(results)
+
+
+def strip_profile_release(cargo):
+    """Remove [profile.release] block from Cargo.toml bytes.
+
+    Returns (edits, 1 if stripped else 0). The stripped manifest ends in
+    exactly one newline.
+    """
+    edits = [(m.start(), m.end(), b"\n") for m in _PROFILE_RE.finditer(cargo)]
+    if not edits:
+        return [], 0
+
+    # FOLD TRAILING WHITESPACE INTO THE EDITS SO THE RESULT ENDS IN ONE "\n"
+    start, end, _ = edits[-1]
+    if end == len(cargo):
+        edits[-1] = (len(cargo[:start].rstrip()), end, b"\n")
+    else:
+        tail = len(cargo.rstrip())
+        if cargo[tail:] != b"\n":
+            edits.append((tail, len(cargo), b"\n"))
+    print("  STRIP: [profile.release] (workspace provides its own)")
+    return edits, 1
 
 
 SCX_BUILD_RS = """\
@@ -156,8 +310,7 @@ fn main() {
 
 def replace_build_rs(dst_root):
     """Replace standalone build.rs with scx_cargo::BpfBuilder version."""
-    build_rs = os.path.join(dst_root, "build.rs")
-    open(build_rs, "w").write(SCX_BUILD_RS)
+    Path(dst_root, "build.rs").write_bytes(SCX_BUILD_RS.encode())
     print("  REPLACE: build.rs -> scx_cargo::BpfBuilder")
     return 1
 
@@ -168,55 +321,60 @@ def read_scx_cargo_version(scx_root):
     if not os.path.exists(cargo_path):
         print(f"  WARNING: {cargo_path} not found, falling back to wildcard version")
         return "*"
-    text = open(cargo_path).read()
-    m = re.search(r'^version\s*=\s*"([^"]+)"', text, re.MULTILINE)
+    m = _VERSION_RE.search(Path(cargo_path).read_bytes())
     if not m:
         print(f"  WARNING: no version found in {cargo_path}, falling back to wildcard")
         return "*"
-    return m.group(1)
+    return m.group(1).decode()
 
 
-def swap_build_deps(dst_root, scx_root):
-    """Replace libbpf-cargo with scx_cargo path+version dep (version read from repo)."""
+_LIBBPF_CARGO_KEY = b'libbpf-cargo = "'
+
+
+def swap_build_deps(cargo, scx_root):
+    """Replace libbpf-cargo with scx_cargo path+version dep (version read from repo).
+
+    Returns (edits, 1 if swapped else 0) against the Cargo.toml bytes.
+    """
     version = read_scx_cargo_version(scx_root)
-    scx_cargo_dep = f'scx_cargo = {{ path = "../../../rust/scx_cargo", version = "{version}" }}'
-
-    cargo_path = os.path.join(dst_root, "Cargo.toml")
-    text = open(cargo_path).read()
-    new_text = re.sub(
-        r'libbpf-cargo\s*=\s*"[^"]*"',
-        scx_cargo_dep,
-        text,
-    )
-    if new_text != text:
-        open(cargo_path, "w").write(new_text)
+    scx_cargo_dep = (
+        f'scx_cargo = {{ path = "../../../rust/scx_cargo", version = "{version}" }}'
+    ).encode()
+
+    # CARGO'S CANONICAL `libbpf-cargo = "x.y"` IS SPLICED DIRECTLY; THE REGEX
+    # ONLY HANDLES HAND-EDITED SPACING
+    start = cargo.find(_LIBBPF_CARGO_KEY)
+    end = cargo.find(b'"', start + len(_LIBBPF_CARGO_KEY)) if start != -1 else -1
+    if end != -1:
+        edits = [(start, end + 1, scx_cargo_dep)]
+    else:
+        edits = [(m.start(), m.end(), scx_cargo_dep)
+                 for m in _LIBBPF_CARGO_RE.finditer(cargo)]
+    if edits:
         print(f"  SWAP: libbpf-cargo -> scx_cargo (version {version})")
-        return 1
+        return edits, 1
     print("  WARNING: libbpf-cargo not found in [build-dependencies]")
-    return 0
+    return [], 0
 
 
-def fix_libbpf_vendoring(dst_root):
+def fix_libbpf_vendoring(cargo):
     """Enable libbpf vendoring by stripping default-features = false from libbpf-rs.
 
     Standalone builds use system libbpf (default-features = false).
     scx CI doesn't have system libbpf on the linker path -- needs vendored build.
     Removing default-features = false re-enables libbpf-sys's vendored-libbpf
     feature, so libbpf.a gets built from source and linked statically.
+
+    Returns (edits, 1 if stripped else 0) against the Cargo.toml bytes.
     """
-    cargo_path = os.path.join(dst_root, "Cargo.toml")
-    text = open(cargo_path).read()
-    new_text = re.sub(
-        r'(libbpf-rs\s*=\s*\{[^}]*),\s*default-features\s*=\s*false',
-        r'\1',
-        text,
-    )
-    if new_text != text:
-        open(cargo_path, "w").write(new_text)
+    # DELETE ONLY THE ", default-features = false" TAIL AFTER GROUP 1
+    edits = [(m.end(1), m.end(), b"")
+             for m in _LIBBPF_NO_DEFAULTS_RE.finditer(cargo)]
+    if edits:
         print("  FIX: libbpf-rs default-features = false stripped (enables vendored libbpf)")
-        return 1
+        return edits, 1
     print("  FIX: libbpf-rs already uses default features")
-    return 0
+    return [], 0
 
 
 def patch_intf_types(dst_root):
@@ -226,31 +384,30 @@ def patch_intf_types(dst_root):
         print("  WARNING: src/bpf/intf.h not found")
         return 0
 
-    text = open(intf_path).read()
+    text = Path(intf_path).read_bytes()
 
     # Insert unconditional typedefs after the include guard.
     # C11+ (and C23 which PANDEMONIUM targets) allows duplicate compatible
     # typedefs, so these coexist safely with vmlinux.h during BPF compilation.
     # scx_utils defines __bpf__ during bindgen, so a #ifndef guard won't work.
     type_compat = (
-        "\n// BINDGEN/SCX COMPATIBILITY: provide kernel types unconditionally.\n"
-        "// vmlinux.h also typedefs these in BPF context; C11+ permits\n"
-        "// duplicate compatible typedefs, so no conflict.\n"
-        "typedef unsigned long long u64;\n"
-        "typedef unsigned char u8;\n"
+        b"\n// BINDGEN/SCX COMPATIBILITY: provide kernel types unconditionally.\n"
+        b"// vmlinux.h also typedefs these in BPF context; C11+ permits\n"
+        b"// duplicate compatible typedefs, so no conflict.\n"
+        b"typedef unsigned long long u64;\n"
+        b"typedef unsigned char u8;\n"
     )
 
-    anchor = "#define __INTF_H\n"
+    anchor = b"#define __INTF_H\n"
     if anchor not in text:
         print("  WARNING: intf.h missing expected include guard, skipping type patch")
         return 0
 
-    if "typedef unsigned long long u64;" in text:
+    if b"typedef unsigned long long u64;" in text:
         print("  PATCH: intf.h type compatibility already present")
         return 0
 
-    new_text = text.replace(anchor, anchor + type_compat)
-    open(intf_path, "w").write(new_text)
+    Path(intf_path).write_bytes(text.replace(anchor, anchor + type_compat))
     print("  PATCH: intf.h type compatibility (u64/u8 for bindgen)")
     return 1
 
@@ -261,10 +418,10 @@ def patch_bpf_skel_include(dst_root):
     if not os.path.exists(skel_path):
         print("  WARNING: src/bpf_skel.rs not found")
         return 0
-    text = open(skel_path).read()
-    new_text = text.replace("/bpf.skel.rs", "/main_skel.rs")
+    text = Path(skel_path).read_bytes()
+    new_text = text.replace(b"/bpf.skel.rs", b"/main_skel.rs")
     if new_text != text:
-        open(skel_path, "w").write(new_text)
+        Path(skel_path).write_bytes(new_text)
         print("  PATCH: bpf_skel.rs include path (bpf.skel.rs -> main_skel.rs)")
         return 1
     return 0
@@ -277,54 +434,60 @@ def add_workspace_member(scx_root):
         print(f"  WARNING: {cargo_path} not found, skipping workspace registration")
         return 0
 
-    text = open(cargo_path).read()
-    member_line = f'    "{DEST_REL}",'
-
-    if DEST_REL in text:
+    # RE-RUNS ARE THE COMMON CASE: TEST THE RAW BYTES BEFORE DECODING ANYTHING
+    data = Path(cargo_path).read_bytes()
+    if _DEST_REL_BYTES in data:
         print("  WORKSPACE: already registered")
         return 0
 
-    # Find the members array and insert alphabetically
-    lines = text.split("\n")
-    new_lines = []
-    inserted = False
-    in_members = False
-
-    for line in lines:
-        if line.strip() == "members = [":
-            in_members = True
-            new_lines.append(line)
-            continue
+    text = data.decode()
+    member_line = f'    "{DEST_REL}",'
 
-        if in_members and not inserted:
-            stripped = line.strip()
-            if stripped == "]":
-                # End of members, insert before closing bracket
-                new_lines.append(member_line)
-                inserted = True
-            elif stripped.startswith('"') and stripped.rstrip(",") > f'"{DEST_REL}"':
-                # Insert before this line (alphabetical order)
-                new_lines.append(member_line)
-                inserted = True
-                in_members = False
-
-        new_lines.append(line)
-
-    if inserted:
-        open(cargo_path, "w").write("\n".join(new_lines))
-        print(f"  WORKSPACE: added {DEST_REL} to members")
-        return 1
+    # Find the members array and insert alphabetically. Only the lines inside
+    # the array are scanned, and the new member is spliced in with one slice.
+    # Lines keep their own endings, so CRLF manifests stay CRLF.
+    opener = _MEMBERS_OPEN_RE.search(text)
+    pos = opener.end() if opener else 0
+    close = text.find("]", pos) if opener else -1
+    if close != -1:
+        newline = "\r\n" if text[pos - 2:pos] == "\r\n" else "\n"
+        close_line = text.rfind("\n", pos, close) + 1 or pos
+        # scx KEEPS members SORTED: RECORD EACH ENTRY'S OFFSET, THEN BISECT
+        offsets, names = [], []
+        for line in text[pos:close].splitlines(keepends=True):
+            m = _MEMBER_RE.match(line)
+            if m:
+                offsets.append(pos)
+                names.append(m.group(1))
+            pos += len(line)
+        i = bisect.bisect_right(names, DEST_REL)
+        if i < len(names):
+            # Insert before the first member sorting after ours
+            insert = offsets[i]
+        elif not text[close_line:close].strip():
+            # End of members, insert before closing bracket
+            insert = close_line
+        else:
+            insert = -1
+        if insert != -1:
+            new_text = text[:insert] + member_line + newline + text[insert:]
+            Path(cargo_path).write_bytes(new_text.encode())
+            print(f"  WORKSPACE: added {DEST_REL} to members")
+            return 1
 
     print(f"  WARNING: could not find insertion point in workspace Cargo.toml")
     return 0
 
 
 def main():
-    if len(sys.argv) != 2:
-        print(f"Usage: {sys.argv[0]} /path/to/scx")
+    args = sys.argv[1:]
+    wait_fmt = "--wait-fmt" in args
+    args = [a for a in args if a != "--wait-fmt"]
+    if len(args) != 1:
+        print(f"Usage: {sys.argv[0]} [--wait-fmt] /path/to/scx")
         sys.exit(1)
 
-    scx_root = os.path.abspath(sys.argv[1])
+    scx_root = os.path.abspath(args[0])
     pand_root = os.path.dirname(os.path.abspath(__file__))
     dst_root = os.path.join(scx_root, DEST_REL)
 
@@ -354,19 +517,28 @@ def main():
     print("\n[1] COPY SOURCE FILES")
     copied = copy_tree(pand_root, dst_root)
 
+    # Cargo.toml IS EDITED BY STEPS 2-4: READ ONCE, COLLECT EVERY STEP'S
+    # EDITS AGAINST THE ORIGINAL BYTES, APPLY AND WRITE ONCE
+    cargo_path = Path(dst_root, "Cargo.toml")
+    cargo = cargo_path.read_bytes()
+    cargo_edits = []
+
     # STEP 2: RENAME CRATE
     print("\n[2] RENAME CRATE")
-    renamed = rename_crate(dst_root)
+    edits, renamed = rename_crate(dst_root, cargo)
+    cargo_edits += edits
 
     # STEP 3: STRIP PROFILE
     print("\n[3] STRIP RELEASE PROFILE")
-    stripped = strip_profile_release(dst_root)
+    edits, stripped = strip_profile_release(cargo)
+    cargo_edits += edits
 
     # STEP 4: BUILD SYSTEM (MATCH scx CONVENTION)
     print("\n[4] BUILD SYSTEM")
     replace_build_rs(dst_root)
-    swap_build_deps(dst_root, scx_root)
-    fix_libbpf_vendoring(dst_root)
+    cargo_edits += swap_build_deps(cargo, scx_root)[0]
+    cargo_edits += fix_libbpf_vendoring(cargo)[0]
+    cargo_path.write_bytes(_apply_edits(cargo, cargo_edits))
     patch_bpf_skel_include(dst_root)
     patch_intf_types(dst_root)
 
@@ -375,16 +547,25 @@ def main():
     registered = add_workspace_member(scx_root)
 
     # STEP 6: CARGO FMT
+    # ALL FILE WRITES ARE DONE; FMT OUTPUT IS INFORMATIONAL, SO BY DEFAULT IT
+    # RUNS DETACHED INSTEAD OF HOLDING UP THE PROMPT
     print("\n[6] FORMAT")
-    result = subprocess.run(
-        ["cargo", "fmt", "--manifest-path", os.path.join(dst_root, "Cargo.toml")],
-        capture_output=True, text=True,
-    )
-    if result.returncode == 0:
-        print("  FMT: cargo fmt applied")
+    fmt_cmd = ["cargo", "fmt", "--manifest-path", os.path.join(dst_root, "Cargo.toml")]
+    if wait_fmt:
+        result = subprocess.run(fmt_cmd, capture_output=True, text=True)
+        if result.returncode == 0:
+            print("  FMT: cargo fmt applied")
+        else:
+            print(f"  FMT: cargo fmt failed ({result.stderr.strip()})")
+            print("  FMT: run manually:", " ".join(fmt_cmd))
     else:
-        print(f"  FMT: cargo fmt failed ({result.stderr.strip()})")
-        print("  FMT: run manually: cargo fmt --manifest-path", os.path.join(dst_root, "Cargo.toml"))
+        proc = subprocess.Popen(
+            fmt_cmd,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        print(f"  FMT: cargo fmt launched in background (pid {proc.pid})")
+        print("  FMT: use --wait-fmt to block on it and see errors")
 
     # SUMMARY
     print(f"\nDONE: {copied} files copied, {renamed} crate renames, "
@@ -15,8 +15,12 @@ Usage:
     ./pandemonium.py rebuild      Force clean rebuild
 """
 
+import os
+import shlex
+import shutil
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -24,8 +28,7 @@ from pathlib import Path
 from pandemonium_common import (
     SCRIPT_DIR, TARGET_DIR, LOG_DIR, BINARY,
     get_version, log_info, log_warn, log_error,
-    run_cmd, run_cmd_capture,
-    has_root_owned_files, check_sources_changed, build,
+    has_root_owned_files, check_sources_changed, remove_build_dir, build,
 )
 
 
@@ -33,6 +36,10 @@ from pandemonium_common import (
 
 INSTALL_PATH = Path("/usr/local/bin/pandemonium")
 
+# SUBCOMMANDS FORWARDED TO tests/pandemonium-tests.py
+TEST_COMMANDS = ("bench-scale", "bench-trace", "bench-contention",
+                 "bench-sys", "bench-pcpu", "bench-scx")
+
 def _service_unit(verbose: bool = False) -> str:
     exec_line = "/usr/local/bin/pandemonium"
     if verbose:
@@ -58,6 +65,60 @@ SERVICE_PATH = Path("/etc/systemd/system/pandemonium.service")
 
 # COMMANDS
 
+def _install_in_process(unit: str) -> int:
+    """Install binary + unit file and daemon-reload without sudo (caller is root).
+
+    The binary is copied to a temp file beside the target and renamed over,
+    so a running pandemonium keeps its old inode (no ETXTBSY) and the swap
+    is atomic.
+    """
+    tmp = INSTALL_PATH.with_name(f".{INSTALL_PATH.name}.tmp")
+    try:
+        shutil.copy2(BINARY, tmp)
+        os.replace(tmp, INSTALL_PATH)
+    except OSError as e:
+        log_error(f"Failed to copy binary: {e}")
+        return 1
+    try:
+        SERVICE_PATH.write_text(unit)
+    except OSError as e:
+        log_error(f"Failed to write service file: {e}")
+        return 1
+    ret = subprocess.run(["systemctl", "daemon-reload"]).returncode
+    if ret != 0:
+        log_error("systemctl daemon-reload failed")
+    return ret
+
+
+# EXIT CODES OF THE BATCHED sudo INSTALL SCRIPT, ONE PER STEP
+_SUDO_INSTALL_ERRORS = {
+    10: "Failed to copy binary (sudo required)",
+    11: "Failed to write service file",
+    12: "systemctl daemon-reload failed",
+}
+
+
+def _install_via_sudo(unit: str) -> int:
+    """Install binary + unit file and daemon-reload in one sudo invocation.
+
+    The unit file is fed on stdin. Each step exits with its own code so the
+    failing step is still reported individually.
+    """
+    script = (
+        # --remove-destination UNLINKS FIRST, SO A RUNNING BINARY IS NOT HIT
+        f"cp --remove-destination {shlex.quote(str(BINARY))} "
+        f"{shlex.quote(str(INSTALL_PATH))} || exit 10\n"
+        f"cat > {shlex.quote(str(SERVICE_PATH))} || exit 11\n"
+        "systemctl daemon-reload || exit 12\n"
+    )
+    proc = subprocess.Popen(["sudo", "sh", "-c", script], stdin=subprocess.PIPE)
+    proc.communicate(input=unit.encode())
+    if proc.returncode != 0:
+        log_error(_SUDO_INSTALL_ERRORS.get(
+            proc.returncode, f"sudo install failed (exit {proc.returncode})"))
+    return proc.returncode
+
+
 def cmd_install(verbose: bool = False) -> int:
     """Build, install binary, create systemd service, and start (once)."""
     if not build(force=True):
@@ -65,35 +126,20 @@ def cmd_install(verbose: bool = False) -> int:
 
     print()
     log_info(f"Installing binary: {INSTALL_PATH}")
-    subprocess.run(["sudo", "rm", "-f", str(INSTALL_PATH)],
-                   capture_output=True)
-    ret = subprocess.run(
-        ["sudo", "cp", str(BINARY), str(INSTALL_PATH)]
-    ).returncode
+    log_info(f"Installing systemd service: {SERVICE_PATH}")
+    unit = _service_unit(verbose=verbose)
+    # ALREADY ROOT: DO THE FILE WORK IN-PROCESS. OTHERWISE ONE sudo FOR ALL OF IT
+    if os.geteuid() == 0:
+        ret = _install_in_process(unit)
+    else:
+        ret = _install_via_sudo(unit)
     if ret != 0:
-        log_error("Failed to copy binary (sudo required)")
         return ret
 
     size = BINARY.stat().st_size // 1024
     log_info(f"Installed {INSTALL_PATH} ({size} KB)")
-
-    print()
-    log_info("Installing systemd service...")
-    unit = _service_unit(verbose=verbose)
-    proc = subprocess.Popen(
-        ["sudo", "tee", str(SERVICE_PATH)],
-        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)
-    proc.communicate(input=unit.encode())
-    if proc.returncode != 0:
-        log_error("Failed to write service file")
-        return proc.returncode
     log_info(f"Created {SERVICE_PATH}")
 
-    ret = subprocess.run(["sudo", "systemctl", "daemon-reload"]).returncode
-    if ret != 0:
-        log_error("systemctl daemon-reload failed")
-        return ret
-
     print()
     log_info("PANDEMONIUM is installed")
     log_info("To start:")
@@ -105,21 +151,73 @@ def cmd_install(verbose: bool = False) -> int:
     return 0
 
 
+def _tree_size(root: Path,
+               stop: threading.Event | None = None) -> tuple[int, bool]:
+    """Disk usage in bytes of everything under root (in-process `du`).
+
+    Iterative scandir walk summing st_blocks * 512 like du, counting
+    hard-linked files once; unreadable directories (e.g. root-owned build
+    output) are skipped. Returns (bytes, complete); setting stop ends the
+    walk early with the partial total.
+    """
+    total = 0
+    seen = set()
+    stack = [str(root)]
+    while stack:
+        if stop is not None and stop.is_set():
+            return total, False
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    st = entry.stat(follow_symlinks=False)
+                    if st.st_nlink > 1 and not entry.is_dir(follow_symlinks=False):
+                        key = (st.st_dev, st.st_ino)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                    total += st.st_blocks * 512
+        except OSError:
+            continue
+    return total, True
+
+
+def _human(n: float) -> str:
+    """Format a byte count like du -h (1024-based, one decimal below 10)."""
+    for unit in ("B", "K", "M", "G", "T"):
+        if n < 1024 or unit == "T":
+            break
+        n /= 1024
+    if unit == "B":
+        return f"{int(n)}B"
+    return f"{n:.1f}{unit}" if n < 10 else f"{n:.0f}{unit}"
+
+
 def cmd_clean() -> int:
     """Wipe build artifacts."""
     if not TARGET_DIR.exists():
         log_info("Already clean, nothing to remove")
         return 0
 
-    ret, out, _ = run_cmd_capture(["du", "-sh", str(TARGET_DIR)])
-    if ret == 0:
-        size = out.strip().split()[0]
-        log_info(f"Build directory: {TARGET_DIR} ({size})")
-
-    resp = input(f"REMOVE {TARGET_DIR}? [Y/N] ").strip().lower()
+    # THE SIZE IS ONLY A HINT FOR THE PROMPT: GIVE THE WALK HALF A SECOND,
+    # THEN REPORT WHATEVER IT HAS COUNTED SO A HUGE TREE NEVER STALLS IT
+    size = []
+    stop = threading.Event()
+    sizer = threading.Thread(
+        target=lambda: size.append(_tree_size(TARGET_DIR, stop)), daemon=True)
+    sizer.start()
+    sizer.join(0.5)
+    stop.set()
+    sizer.join()
+    total, complete = size[0]
+    human = ("" if complete else "at least ") + _human(total)
+    log_info(f"Build directory: {TARGET_DIR} ({human})")
+
+    resp = input(f"REMOVE {TARGET_DIR} ({human})? [Y/N] ").strip().lower()
     if resp == "y":
         log_info("Removing build directory...")
-        run_cmd(["sudo", "rm", "-rf", str(TARGET_DIR)])
+        remove_build_dir()
         log_info("Clean complete")
     else:
         log_info("Aborted")
@@ -127,13 +225,46 @@ def cmd_clean() -> int:
     return 0
 
 
+def _scan_logs(log_dir: Path) -> tuple[int, str | None]:
+    """Count *.log files and find the newest by mtime in one scandir pass.
+
+    Names are not uniformly stamped (latest.log, test-YYYY-NNNNNN.log), so
+    the mtime decides. The latest.log symlink is counted but never reported
+    as the newest; it only points at one of the real logs.
+    """
+    count = 0
+    latest = None
+    latest_mtime = 0.0
+    with os.scandir(log_dir) as it:
+        for entry in it:
+            if not entry.name.endswith(".log"):
+                continue
+            count += 1
+            if entry.is_symlink():
+                continue
+            try:
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+            except OSError:
+                continue
+            if latest is None or mtime > latest_mtime:
+                latest, latest_mtime = entry.name, mtime
+    return count, latest
+
+
 def cmd_status() -> int:
     """Show build/install status."""
     print()
 
-    if BINARY.exists():
-        size = BINARY.stat().st_size // 1024
-        mtime = datetime.fromtimestamp(BINARY.stat().st_mtime)
+    # STAT THE BINARY ONCE; EVERY CHECK BELOW (INCLUDING THE SOURCE SCAN)
+    # REUSES IT
+    try:
+        bin_st = BINARY.stat()
+    except FileNotFoundError:
+        bin_st = None
+
+    if bin_st:
+        size = bin_st.st_size // 1024
+        mtime = datetime.fromtimestamp(bin_st.st_mtime)
         print(f"  Binary:    {BINARY}")
         print(f"             {size} KB, built {mtime.strftime('%Y-%m-%d %H:%M:%S')}")
     else:
@@ -152,14 +283,14 @@ def cmd_status() -> int:
     root = has_root_owned_files()
     if root:
         print(f"  State:     ROOT-OWNED FILES PRESENT (run clean)")
-    elif not BINARY.exists():
+    elif not bin_st:
         print(f"  State:     NOT BUILT")
     else:
         print(f"  State:     OK")
     print()
 
-    if BINARY.exists():
-        changed = check_sources_changed()
+    if bin_st:
+        changed = check_sources_changed(bin_mtime_ns=bin_st.st_mtime_ns)
         if changed and changed[0] != "(binary not found)":
             print(f"  Sources:   {len(changed)} file(s) changed since last build")
         else:
@@ -167,11 +298,10 @@ def cmd_status() -> int:
         print()
 
     if LOG_DIR.exists():
-        logs = sorted(LOG_DIR.glob("*.log"))
-        print(f"  Logs:      {LOG_DIR}/ ({len(logs)} file(s))")
-        if logs:
-            latest = max(logs, key=lambda p: p.stat().st_mtime)
-            print(f"             Latest: {latest.name}")
+        count, latest = _scan_logs(LOG_DIR)
+        print(f"  Logs:      {LOG_DIR}/ ({count} file(s))")
+        if latest:
+            print(f"             Latest: {latest}")
     else:
         print(f"  Logs:      {LOG_DIR}/ (not created yet)")
     print()
@@ -197,42 +327,12 @@ def main() -> int:
         return cmd_status()
     elif cmd == "rebuild":
         return 0 if build(force=True) else 1
-    elif cmd == "bench-scale":
-        return subprocess.run(
-            [sys.executable, str(SCRIPT_DIR / "tests" / "pandemonium-tests.py"),
-             "bench-scale"] + sys.argv[2:],
-            cwd=SCRIPT_DIR,
-        ).returncode
-    elif cmd == "bench-trace":
-        return subprocess.run(
-            [sys.executable, str(SCRIPT_DIR / "tests" / "pandemonium-tests.py"),
-             "bench-trace"] + sys.argv[2:],
-            cwd=SCRIPT_DIR,
-        ).returncode
-    elif cmd == "bench-contention":
-        return subprocess.run(
-            [sys.executable, str(SCRIPT_DIR / "tests" / "pandemonium-tests.py"),
-             "bench-contention"] + sys.argv[2:],
-            cwd=SCRIPT_DIR,
-        ).returncode
-    elif cmd == "bench-sys":
-        return subprocess.run(
-            [sys.executable, str(SCRIPT_DIR / "tests" / "pandemonium-tests.py"),
-             "bench-sys"] + sys.argv[2:],
-            cwd=SCRIPT_DIR,
-        ).returncode
-    elif cmd == "bench-pcpu":
-        return subprocess.run(
-            [sys.executable, str(SCRIPT_DIR / "tests" / "pandemonium-tests.py"),
-             "bench-pcpu"] + sys.argv[2:],
-            cwd=SCRIPT_DIR,
-        ).returncode
-    elif cmd == "bench-scx":
-        return subprocess.run(
-            [sys.executable, str(SCRIPT_DIR / "tests" / "pandemonium-tests.py"),
-             "bench-scx"] + sys.argv[2:],
-            cwd=SCRIPT_DIR,
-        ).returncode
+    elif cmd in TEST_COMMANDS:
+        # HAND THE PROCESS OVER TO THE TEST ORCHESTRATOR: NO SECOND
+        # INTERPRETER WAITING ON IT, AND SIGNALS GO STRAIGHT TO IT
+        os.chdir(SCRIPT_DIR)
+        tests = str(SCRIPT_DIR / "tests" / "pandemonium-tests.py")
+        os.execv(sys.executable, [sys.executable, tests, cmd] + sys.argv[2:])
     else:
         log_error(f"Unknown command: {cmd}")
         print()
@@ -4,15 +4,22 @@ Shared infrastructure for PANDEMONIUM build/test scripts.
 Used by pandemonium.py (build manager) and tests/pandemonium-tests.py (test orchestrator).
 """
 
+import functools
 import glob
+import hashlib
+import heapq
+import json
 import math
 import os
 import platform
+import re
+import select
 import shutil
+import signal
 import subprocess
 import sys
+import threading
 import time
-from datetime import datetime
 from pathlib import Path
 
 
@@ -25,14 +32,19 @@ _real_home = Path(f"/home/{_sudo_user}") if _sudo_user else Path.home()
 LOG_DIR = _real_home / ".cache" / "pandemonium"
 ARCHIVE_DIR = LOG_DIR
 BINARY = TARGET_DIR / "release" / "pandemonium"
+SOURCE_MANIFEST = TARGET_DIR / ".src_manifest.json"
+# ONE ENV FOR EVERY CARGO CALL IN THIS PROCESS; EXTEND WITH `_CARGO_ENV | {...}`
+_CARGO_ENV = os.environ | {"CARGO_TARGET_DIR": str(TARGET_DIR)}
 VMLINUX_CACHE = ARCHIVE_DIR / "vmlinux.h"
 MIN_KERNEL = (6, 12)
 
-SOURCE_PATTERNS = [
-    "src/**/*.rs", "src/**/*.c", "src/**/*.h",
-    "tests/**/*.rs",
-    "Cargo.toml", "build.rs",
-]
+# FRESHNESS INPUTS: TOP-LEVEL FILES PLUS (TREE, SUFFIXES) WALKED RECURSIVELY.
+SOURCE_FILES = ("Cargo.toml", "Cargo.lock", "build.rs")
+SOURCE_TREES = (
+    ("src", (".rs", ".c", ".h")),
+    ("tests", (".rs",)),
+)
+SCAN_WORKERS = min(8, os.cpu_count() or 1)
 
 
 def get_version() -> str:
@@ -68,28 +80,69 @@ def get_git_info() -> dict:
 
 # LOGGING
 
+# (EPOCH SECOND, FORMATTED PREFIX): strftime RUNS ONCE PER SECOND, NOT PER LINE
+_ts_cache = (0, "")
+
+
 def _timestamp() -> str:
-    return datetime.now().strftime("[%H:%M:%S]")
+    global _ts_cache
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache = (now, time.strftime("[%H:%M:%S]", time.localtime(now)))
+    return _ts_cache[1]
+
+
+def _log(tag: str, msg: str) -> None:
+    sys.stdout.write(f"{_timestamp()} {tag} {msg}\n")
+    sys.stdout.flush()
 
 
 def log_info(msg: str) -> None:
-    print(f"{_timestamp()} [INFO]   {msg}", flush=True)
+    _log("[INFO]  ", msg)
 
 
 def log_warn(msg: str) -> None:
-    print(f"{_timestamp()} [WARN]   {msg}", flush=True)
+    _log("[WARN]  ", msg)
 
 
 def log_error(msg: str) -> None:
-    print(f"{_timestamp()} [ERROR]  {msg}", flush=True)
+    _log("[ERROR] ", msg)
 
 
 def run_cmd(cmd: list, cwd: Path | None = None,
-            env: dict | None = None) -> int:
-    """Run a command with real-time output to terminal."""
-    print(f">>> {' '.join(str(c) for c in cmd)}")
-    result = subprocess.run(cmd, cwd=cwd, env=env)
-    return result.returncode
+            env: dict | None = None, new_session: bool = False) -> int:
+    """Run a command with real-time output to terminal.
+
+    With new_session, the child (and everything it spawns, e.g. rustc)
+    runs in its own session and SIGINT/SIGTERM are forwarded to the whole
+    group, so Ctrl-C tears down the tree instead of orphaning workers.
+    Not for sudo: a new session has no terminal to prompt on.
+    """
+    print(f">>> {' '.join(str(c) for c in cmd)}", flush=True)
+    if not new_session or threading.current_thread() is not threading.main_thread():
+        return subprocess.run(cmd, cwd=cwd, env=env).returncode
+
+    proc = subprocess.Popen(cmd, cwd=cwd, env=env, start_new_session=True)
+    caught = []
+
+    def forward(signum, frame):
+        caught.append(signum)
+        try:
+            os.killpg(proc.pid, signum)
+        except ProcessLookupError:
+            pass
+
+    prev = {sig: signal.signal(sig, forward)
+            for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        ret = proc.wait()
+    finally:
+        for sig, handler in prev.items():
+            signal.signal(sig, handler)
+    if caught:
+        # CHILD HAS EXITED; NOW DELIVER THE SIGNAL TO OURSELVES AS USUAL
+        signal.raise_signal(caught[0])
+    return ret
 
 
 def run_cmd_capture(cmd: list, cwd: Path | None = None,
@@ -102,16 +155,64 @@ def run_cmd_capture(cmd: list, cwd: Path | None = None,
 
 # BUILD
 
+def _first_root_owned(root: Path, max_depth: int = 4):
+    """Yield paths owned by root under root, to max_depth (like find -maxdepth)."""
+    try:
+        if os.stat(root, follow_symlinks=False).st_uid == 0:
+            yield str(root)
+    except FileNotFoundError:
+        return
+    stack = [(str(root), 0)]
+    while stack:
+        path, depth = stack.pop()
+        try:
+            it = os.scandir(path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.stat(follow_symlinks=False).st_uid == 0:
+                        yield entry.path
+                    if depth + 1 < max_depth and entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, depth + 1))
+                except FileNotFoundError:
+                    pass
+
+
 def has_root_owned_files() -> bool:
     """Check if sudo left root-owned files anywhere in the build tree."""
+    return next(_first_root_owned(TARGET_DIR), None) is not None
+
+
+def remove_build_dir(root_owned: bool | None = None) -> None:
+    """Delete TARGET_DIR, escalating to sudo only for root-owned trees.
+
+    A user-owned tree (or any tree when already root) is removed in-process
+    with no fork. Otherwise one `sudo rm -rf` per top-level child runs in
+    parallel, since rm itself unlinks single-threaded.
+    """
     if not TARGET_DIR.exists():
-        return False
-    result = subprocess.run(
-        ["find", str(TARGET_DIR), "-user", "root", "-maxdepth", "4",
-         "-print", "-quit"],
-        capture_output=True, text=True,
-    )
-    return bool(result.stdout.strip())
+        return
+    if root_owned is None:
+        root_owned = has_root_owned_files()
+    if os.geteuid() == 0 or not root_owned:
+        shutil.rmtree(TARGET_DIR, ignore_errors=True)
+        if not TARGET_DIR.exists():
+            return
+        # ROOT-OWNED FILES DEEPER THAN THE DETECTION DEPTH: FALL THROUGH
+    # PROMPT FOR A PASSWORD ONCE, THEN FAN OUT NON-INTERACTIVELY SO
+    # PARALLEL SUDOS NEVER FIGHT OVER THE TERMINAL
+    subprocess.run(["sudo", "-v"])
+    try:
+        with os.scandir(TARGET_DIR) as it:
+            children = [entry.path for entry in it]
+    except OSError:
+        children = []
+    procs = [subprocess.Popen(["sudo", "-n", "rm", "-rf", child]) for child in children]
+    for proc in procs:
+        proc.wait()
+    subprocess.run(["sudo", "-n", "rm", "-rf", str(TARGET_DIR)])
 
 
 def clean_root_files() -> bool:
@@ -120,26 +221,312 @@ def clean_root_files() -> bool:
     resp = input("CLEAN ENTIRE BUILD DIR? [Y/N] ").strip().lower()
     if resp == "y":
         log_info("Cleaning build directory...")
-        run_cmd(["sudo", "rm", "-rf", str(TARGET_DIR)])
+        remove_build_dir(root_owned=True)
         log_info("Build directory cleaned")
         return True
     log_error("Cannot build with root-owned files, aborting")
     return False
 
 
-def check_sources_changed() -> list[str]:
-    """Return list of source files newer than the binary (empty = up to date)."""
-    if not BINARY.exists():
-        return ["(binary not found)"]
-    bin_mtime = BINARY.stat().st_mtime
+def _iter_tree(top: str, suffixes: tuple, stop: threading.Event | None = None):
+    """Yield (relpath, path, stat) for matching files under top, lazily.
+
+    Every file costs a single cached DirEntry stat. Stops early once stop
+    is set.
+    """
+    stack = [top]
+    while stack:
+        if stop is not None and stop.is_set():
+            return
+        try:
+            it = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffixes):
+                    yield (os.path.relpath(entry.path, SCRIPT_DIR), entry.path,
+                           entry.stat(follow_symlinks=False))
+
+
+def _source_units(stop: threading.Event | None = None) -> list:
+    """Split freshness inputs into independently walkable units.
+
+    The first unit holds SOURCE_FILES and the files directly inside each
+    source tree; every immediate subdirectory of a tree is its own unit.
+    Units are ordered newest directory mtime first: adding, removing or
+    atomically saving a file bumps its directory, so first-hit scans
+    usually stop in the first unit. In-place edits don't, which is why
+    every unit is still walked before declaring the tree clean.
+    """
+    top = []
+    top_hint = 0
+    for name in SOURCE_FILES:
+        path = str(SCRIPT_DIR / name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        top.append((name, path, st))
+        top_hint = max(top_hint, st.st_mtime_ns)
+    subtrees = []
+    for tree, suffixes in SOURCE_TREES:
+        try:
+            top_hint = max(top_hint, os.stat(SCRIPT_DIR / tree).st_mtime_ns)
+            it = os.scandir(SCRIPT_DIR / tree)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subtrees.append((entry.stat(follow_symlinks=False).st_mtime_ns,
+                                     _iter_tree(entry.path, suffixes, stop)))
+                elif entry.name.endswith(suffixes):
+                    top.append((os.path.relpath(entry.path, SCRIPT_DIR), entry.path,
+                                entry.stat(follow_symlinks=False)))
+    subtrees.append((top_hint, top))
+    subtrees.sort(key=lambda hint_unit: hint_unit[0], reverse=True)
+    return [unit for _, unit in subtrees]
+
+
+def _iter_sources():
+    """Yield (relpath, path, stat) for every freshness input, lazily."""
+    for unit in _source_units():
+        yield from unit
+
+
+def _hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+
+def _load_manifest() -> dict:
+    """Return {relpath: [mtime_ns, hash]} recorded by the last good build."""
+    try:
+        with open(SOURCE_MANIFEST) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _snapshot_sources(manifest: dict) -> dict:
+    """Record mtime and content hash of every source, reusing unchanged hashes."""
+    snapshot = {}
+    for rel, path, st in _iter_sources():
+        prev = manifest.get(rel)
+        if prev and prev[0] == st.st_mtime_ns:
+            snapshot[rel] = prev
+        else:
+            snapshot[rel] = [st.st_mtime_ns, _hash_file(path)]
+    return snapshot
+
+
+def _write_manifest(snapshot: dict) -> None:
+    tmp = SOURCE_MANIFEST.with_suffix(".tmp")
+    try:
+        tmp.write_text(json.dumps(snapshot, separators=(",", ":")))
+        os.replace(tmp, SOURCE_MANIFEST)
+    except OSError as e:
+        log_warn(f"Could not write source manifest: {e}")
+
+
+def _content_unchanged(rel: str, path: str, st: os.stat_result,
+                       manifest: dict, restore_mtime: bool = False) -> bool:
+    """True if a newer-looking file still matches the last built content.
+
+    Checkouts and cache restores bump mtimes without touching content. With
+    restore_mtime (build() only), a hash match also puts the built mtime
+    back so later checks and cargo's own fingerprints see the file as fresh.
+    """
+    prev = manifest.get(rel)
+    if not prev:
+        return False
+    if prev[0] == st.st_mtime_ns:
+        return True
+    try:
+        if _hash_file(path) != prev[1]:
+            return False
+    except OSError:
+        return False
+    if restore_mtime:
+        try:
+            os.utime(path, ns=(st.st_atime_ns, prev[0]))
+        except OSError:
+            pass
+    return True
+
+
+def _scan_unit(unit, bin_mtime_ns: int, collect: bool, manifest,
+               stop: threading.Event, restore_mtimes: bool) -> list[str]:
     changed = []
-    for pattern in SOURCE_PATTERNS:
-        for src in SCRIPT_DIR.glob(pattern):
-            if src.stat().st_mtime > bin_mtime:
-                changed.append(str(src.relative_to(SCRIPT_DIR)))
+    for rel, path, st in unit:
+        if st.st_mtime_ns <= bin_mtime_ns:
+            continue
+        if _content_unchanged(rel, path, st, manifest(), restore_mtimes):
+            continue
+        changed.append(rel)
+        if not collect:
+            stop.set()
+            break
     return changed
 
 
+def _walk_sources(bin_mtime_ns: int, collect: bool,
+                  restore_mtimes: bool = False) -> list[str]:
+    """Return sources newer than bin_mtime_ns, relative to SCRIPT_DIR.
+
+    Subtrees are scanned on a thread pool (scandir/stat release the GIL).
+    Without collect, every worker stops once any one finds a changed file.
+    """
+    stop = threading.Event()
+    units = _source_units(stop)
+    # MANIFEST IS ONLY READ IF SOMETHING LOOKS NEWER THAN THE BINARY.
+    manifest = functools.cache(_load_manifest)
+    changed = []
+    if len(units) == 1 or SCAN_WORKERS == 1:
+        for unit in units:
+            changed += _scan_unit(unit, bin_mtime_ns, collect, manifest, stop,
+                                  restore_mtimes)
+            if stop.is_set():
+                break
+    else:
+        # DEFERRED: concurrent.futures DRAGS IN logging, AND ONLY MULTI-UNIT
+        # SCANS NEED A POOL
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(units))) as pool:
+            futures = [pool.submit(_scan_unit, unit, bin_mtime_ns, collect,
+                                   manifest, stop, restore_mtimes)
+                       for unit in units]
+            for fut in as_completed(futures):
+                changed += fut.result()
+    return sorted(changed) if collect else changed[:1]
+
+
+def _restore_git_mtimes() -> int:
+    """Set each tracked source's mtime to its last commit time.
+
+    A fresh checkout stamps every file with checkout time, which makes all
+    sources look newer than a cached binary. Reads one newest-first
+    `git log` stream and stops once every source has been dated. Only files
+    whose content still matches the last build's manifest are re-dated: a
+    commit time says nothing about what the cached binary was built from
+    (merges list no files, so merged-in files carry their branch's older
+    time). Skipped on a dirty tree, where mtimes reflect real edits.
+    Returns files touched.
+    """
+    manifest = _load_manifest()
+    if not manifest:
+        return 0
+    try:
+        r = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, cwd=SCRIPT_DIR,
+        )
+    except FileNotFoundError:
+        return 0
+    if r.returncode != 0 or r.stdout.strip():
+        return 0
+
+    pending = {rel: (path, st) for rel, path, st in _iter_sources()}
+    touched = 0
+    proc = subprocess.Popen(
+        ["git", "-c", "core.quotePath=false", "log", "--name-only",
+         "--format=%x00%ct", "HEAD"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        cwd=SCRIPT_DIR,
+    )
+    try:
+        ct_ns = 0
+        for line in proc.stdout:
+            line = line.rstrip("\n")
+            if line.startswith("\0"):
+                ct_ns = int(line[1:]) * 1_000_000_000
+                continue
+            hit = pending.pop(line, None)
+            if hit is None:
+                continue
+            path, st = hit
+            if (st.st_mtime_ns != ct_ns
+                    and _content_unchanged(line, path, st, manifest)):
+                try:
+                    os.utime(path, ns=(st.st_atime_ns, ct_ns))
+                    touched += 1
+                except OSError:
+                    pass
+            if not pending:
+                break
+    finally:
+        proc.kill()
+        proc.wait()
+        proc.stdout.close()
+    return touched
+
+
+def _top_level_changed(bin_mtime_ns: int,
+                       restore_mtimes: bool = False) -> list[str]:
+    """Return the first changed SOURCE_FILES entry, checking only those.
+
+    A manifest, lockfile or build script change rebuilds the crate no
+    matter what, so there is no need to walk the source trees to decide.
+    An empty result says nothing about src/ and tests/.
+    """
+    manifest = functools.cache(_load_manifest)
+    for name in SOURCE_FILES:
+        path = str(SCRIPT_DIR / name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if (st.st_mtime_ns > bin_mtime_ns
+                and not _content_unchanged(name, path, st, manifest(),
+                                           restore_mtimes)):
+            return [name]
+    return []
+
+
+# FRESHNESS RESULTS PER BINARY MTIME, SO REPEAT CHECKS IN ONE RUN ARE FREE.
+# A REBUILD BUMPS THE BINARY MTIME AND NATURALLY MISSES THE CACHE.
+_fresh_cache: dict[int, list[str]] = {}
+
+
+def check_sources_changed(bin_mtime_ns: int | None = None,
+                          restore_mtimes: bool = False) -> list[str]:
+    """Return list of source files newer than the binary (empty = up to date).
+
+    Callers that already stat'd the binary pass its mtime to skip a re-stat.
+    Read-only unless restore_mtimes is set (build() only): then files whose
+    content still matches the last build get their built mtime back.
+    """
+    if bin_mtime_ns is None:
+        try:
+            bin_mtime_ns = BINARY.stat().st_mtime_ns
+        except FileNotFoundError:
+            return ["(binary not found)"]
+    if bin_mtime_ns not in _fresh_cache:
+        _fresh_cache[bin_mtime_ns] = _walk_sources(
+            bin_mtime_ns, collect=True, restore_mtimes=restore_mtimes)
+    return list(_fresh_cache[bin_mtime_ns])
+
+
+def source_newer_than_binary(bin_mtime_ns: int | None = None) -> str | None:
+    """Return the first source file newer than the binary, or None."""
+    if bin_mtime_ns is None:
+        try:
+            bin_mtime_ns = BINARY.stat().st_mtime_ns
+        except FileNotFoundError:
+            return "(binary not found)"
+    changed = _fresh_cache.get(bin_mtime_ns)
+    if changed is None:
+        changed = _walk_sources(bin_mtime_ns, collect=False)
+        # AN EMPTY FIRST-HIT WALK SAW EVERY FILE, SO IT IS A FULL ANSWER.
+        if not changed:
+            _fresh_cache[bin_mtime_ns] = changed
+    return changed[0] if changed else None
+
+
 def check_kernel_version() -> bool:
     """Verify kernel >= 6.12 (sched_ext requirement). Returns True if OK."""
     release = platform.release()
@@ -160,8 +547,12 @@ def check_kernel_version() -> bool:
 
 def ensure_vmlinux_h() -> bool:
     """Check vmlinux.h cache. Generated by bpftool on first build if missing."""
-    if VMLINUX_CACHE.exists() and VMLINUX_CACHE.stat().st_size > 1000:
-        log_info(f"vmlinux.h cached ({VMLINUX_CACHE.stat().st_size // 1024} KB)")
+    try:
+        size = VMLINUX_CACHE.stat().st_size
+    except FileNotFoundError:
+        size = 0
+    if size > 1000:
+        log_info(f"vmlinux.h cached ({size // 1024} KB)")
         return True
     log_info("vmlinux.h not cached (bpftool will generate on first build)")
     return True
@@ -178,11 +569,26 @@ def build(force: bool = False) -> bool:
         if not clean_root_files():
             return False
 
+    # OPT-IN ONLY: UNDO CHECKOUT-TIME MTIMES BEFORE JUDGING FRESHNESS.
+    if os.environ.get("PANDEMONIUM_RESTORE_MTIMES") == "1":
+        touched = _restore_git_mtimes()
+        if touched:
+            log_info(f"Restored commit mtimes on {touched} source file(s)")
+
     if not force:
-        changed = check_sources_changed()
+        # ONE STAT OF THE BINARY FEEDS BOTH THE FRESHNESS CHECK AND THE LOG.
+        # TOP-LEVEL INPUTS ARE CHECKED FIRST: IF ONE CHANGED, REBUILD
+        # WITHOUT WALKING THE SOURCE TREES.
+        try:
+            bin_st = BINARY.stat()
+            changed = (_top_level_changed(bin_st.st_mtime_ns,
+                                          restore_mtimes=True)
+                       or check_sources_changed(bin_mtime_ns=bin_st.st_mtime_ns,
+                                                restore_mtimes=True))
+        except FileNotFoundError:
+            changed = ["(binary not found)"]
         if not changed:
-            size = BINARY.stat().st_size // 1024
-            log_info(f"Binary up to date ({size} KB), skipping build")
+            log_info(f"Binary up to date ({bin_st.st_size // 1024} KB), skipping build")
             return True
         if changed[0] != "(binary not found)":
             log_info(f"Source changes detected ({len(changed)} file(s))")
@@ -193,7 +599,7 @@ def build(force: bool = False) -> bool:
         log_info("Forced rebuild, cleaning package + BPF artifacts...")
         subprocess.run(
             ["cargo", "clean", "-p", "pandemonium"],
-            env={**os.environ, "CARGO_TARGET_DIR": str(TARGET_DIR)},
+            env=_CARGO_ENV,
             cwd=str(SCRIPT_DIR),
             capture_output=True,
         )
@@ -202,20 +608,28 @@ def build(force: bool = False) -> bool:
         for d in glob.glob(str(TARGET_DIR / "release" / "build" / "pandemonium-*")):
             shutil.rmtree(d, ignore_errors=True)
 
+    # SNAPSHOT INPUTS BEFORE CARGO RUNS SO EDITS MADE MID-BUILD STILL
+    # COUNT AS CHANGES NEXT TIME.
+    snapshot = _snapshot_sources(_load_manifest())
+
     log_info("Building (release)...")
     ret = run_cmd(
         ["cargo", "build", "--release"],
-        env={**os.environ, "CARGO_TARGET_DIR": str(TARGET_DIR)},
+        env=_CARGO_ENV,
         cwd=SCRIPT_DIR,
+        new_session=True,
     )
 
     if ret != 0:
         log_error("Build failed!")
         return False
+    _write_manifest(snapshot)
 
-    if BINARY.exists():
+    try:
         size = BINARY.stat().st_size // 1024
         log_info(f"Build complete: {BINARY} ({size} KB)")
+    except FileNotFoundError:
+        pass
     return True
 
 
@@ -243,10 +657,12 @@ def mean_stdev(values: list[float]) -> tuple[float, float]:
     if not values:
         return 0.0, 0.0
     n = len(values)
-    mean = sum(values) / n
+    # fsum ACCUMULATES IN C WITH EXACT ROUNDING. statistics.stdev WOULD BE
+    # SLOWER HERE: IT SUMS THROUGH Fraction OBJECTS
+    mean = math.fsum(values) / n
     if n < 2:
         return mean, 0.0
-    variance = sum((x - mean) ** 2 for x in values) / (n - 1)
+    variance = math.fsum([(x - mean) * (x - mean) for x in values]) / (n - 1)
     return mean, math.sqrt(variance)
 
 
@@ -254,31 +670,164 @@ def percentile(values: list[float], pct: float) -> float:
     """Compute percentile (0-100) using nearest-rank method."""
     if not values:
         return 0.0
-    s = sorted(values)
-    k = max(0, min(int(math.ceil(pct / 100.0 * len(s))) - 1, len(s) - 1))
-    return s[k]
+    n = len(values)
+    k = max(0, min(int(math.ceil(pct / 100.0 * n)) - 1, n - 1))
+    # TAIL RANKS (p99) ONLY NEED THE TOP n - k VALUES: ONE BOUNDED HEAP
+    # PASS INSTEAD OF SORTING EVERY SAMPLE TO READ ONE OF THEM
+    if n - k <= n // 8:
+        return heapq.nlargest(n - k, values)[-1]
+    return sorted(values)[k]
+
+
+# PRIVILEGED HELPER
+
+PRIV_HELPER = SCRIPT_DIR / "tests" / "privhelper.py"
+_priv_proc: subprocess.Popen | None = None
+_priv_lock = threading.Lock()
+
+
+def start_priv_helper() -> bool:
+    """Start the long-lived sudo helper (tests/privhelper.py).
+
+    While it runs, CPU hotplug and dmesg reads go over its pipe instead of
+    forking sudo each time. Callers keep their sudo fallback, so a helper
+    that fails to start (or dies) only costs speed.
+    """
+    global _priv_proc
+    if _priv_proc is not None and _priv_proc.poll() is None:
+        return True
+    if os.geteuid() == 0:
+        return False
+    try:
+        _priv_proc = subprocess.Popen(
+            ["sudo", sys.executable, "-u", str(PRIV_HELPER)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    except OSError:
+        return False
+    return True
+
+
+def stop_priv_helper() -> None:
+    global _priv_proc
+    proc, _priv_proc = _priv_proc, None
+    if proc is None:
+        return
+    try:
+        proc.stdin.write(b'{"op": "exit"}\n')
+        proc.stdin.close()
+    except OSError:
+        pass
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def _priv_abandon(proc: subprocess.Popen) -> None:
+    """Kill a helper whose pipe is out of step; later calls fall back to sudo."""
+    global _priv_proc
+    if _priv_proc is proc:
+        _priv_proc = None
+    proc.kill()
+    proc.wait()
+
+
+def priv_call(req: dict) -> dict | None:
+    """One request/reply round trip; None when no helper is running."""
+    proc = _priv_proc
+    if proc is None:
+        return None
+    with _priv_lock:
+        try:
+            proc.stdin.write(json.dumps(req).encode() + b"\n")
+            proc.stdin.flush()
+            reply = json.loads(proc.stdout.readline())
+        except (OSError, ValueError):
+            # EOF (AN EMPTY LINE) OR A TRUNCATED REPLY: THE HELPER IS GONE
+            _priv_abandon(proc)
+            return None
+    return None if "error" in reply else reply
+
+
+def priv_stream(req: dict):
+    """Yield the raw lines (bytes, no newline) of a streaming request.
+
+    The helper sends them in {"bytes": n} frames, so lines are never
+    decoded here; that is left to whoever prints one.
+
+    Returns without yielding when no helper is running; check priv_alive()
+    first to tell that apart from an empty result. Raises OSError when the
+    stream fails before its end record (the helper reported an error, died
+    or sent garbage), so callers never mistake a partial result for a full
+    one. An early exit drains the rest of the stream so the pipe stays in
+    step.
+    """
+    proc = _priv_proc
+    if proc is None:
+        return
+    with _priv_lock:
+        in_step = False
+        try:
+            proc.stdin.write(json.dumps(req).encode() + b"\n")
+            proc.stdin.flush()
+            for line in proc.stdout:
+                reply = json.loads(line)
+                if "bytes" not in reply:
+                    in_step = True
+                    if reply.get("error"):
+                        raise OSError(f"privileged helper: {reply['error']}")
+                    return
+                data = proc.stdout.read(reply["bytes"])
+                if len(data) < reply["bytes"]:
+                    break
+                yield from data.split(b"\n")[:-1]
+            raise OSError("privileged helper exited mid-stream")
+        except ValueError:
+            # NO WAY TO RESYNC AFTER A GARBLED REPLY
+            in_step = True
+            _priv_abandon(proc)
+            raise OSError("privileged helper sent a malformed reply")
+        finally:
+            if not in_step:
+                _priv_drain_or_abandon(proc)
+
+
+def _priv_drain_or_abandon(proc: subprocess.Popen) -> None:
+    """Skip to the end record of an unfinished stream, or kill the helper."""
+    if proc.poll() is None:
+        try:
+            for line in proc.stdout:
+                reply = json.loads(line)
+                if "bytes" not in reply:
+                    return
+                proc.stdout.read(reply["bytes"])
+        except (OSError, ValueError):
+            pass
+    _priv_abandon(proc)
+
+
+def priv_alive() -> bool:
+    return _priv_proc is not None and _priv_proc.poll() is None
 
 
 # CPU MANAGEMENT
 
+# "0-3,8,10-11": EACH MATCH IS ONE CPU OR ONE lo-hi RANGE
+_CPU_RANGE_RE = re.compile(rb"(\d+)(?:-(\d+))?")
+
+
 def _parse_cpu_range(path: str) -> int:
     try:
-        raw = Path(path).read_text().strip()
+        raw = Path(path).read_bytes()
     except (FileNotFoundError, PermissionError):
         return os.cpu_count() or 1
-    count = 0
-    for r in raw.split(","):
-        parts = r.split("-")
-        if len(parts) == 1 and parts[0].strip().isdigit():
-            count += 1
-        elif len(parts) == 2:
-            try:
-                count += int(parts[1]) - int(parts[0]) + 1
-            except ValueError:
-                pass
-    return count
+    return sum(int(hi) - int(lo) + 1 if hi else 1
+               for lo, hi in _CPU_RANGE_RE.findall(raw))
 
 
+# THE POSSIBLE MASK IS FIXED AT BOOT; ONLINE CHANGES WITH HOTPLUG
+@functools.cache
 def get_possible_cpus() -> int:
     return _parse_cpu_range("/sys/devices/system/cpu/possible")
 
@@ -299,17 +848,56 @@ def set_cpu_online(cpu: int, online: bool) -> bool:
     return ret.returncode == 0
 
 
+def _set_cpus_online(cpus: range, online: bool,
+                     stop_on_error: bool) -> int | None:
+    """Write cpuN/online for every CPU in one privileged pass.
+
+    In-process when already root, over the privileged helper when one is
+    running, otherwise a single `sudo sh` loop in place of one `sudo tee`
+    per CPU. Returns the first CPU that failed
+    (the pass stops there when stop_on_error), or None.
+    """
+    cpus = [cpu for cpu in cpus if cpu != 0]
+    if not cpus:
+        return None
+    value = "1" if online else "0"
+    if os.geteuid() == 0:
+        failed = None
+        for cpu in cpus:
+            try:
+                with open(f"/sys/devices/system/cpu/cpu{cpu}/online", "w") as f:
+                    f.write(value)
+            except OSError:
+                failed = cpu if failed is None else failed
+                if stop_on_error:
+                    break
+        return failed
+    reply = priv_call({"op": "cpu_online", "cpus": cpus, "val": int(online),
+                       "stop_on_error": stop_on_error})
+    if reply is not None:
+        return reply["failed"]
+    on_fail = "echo $c; exit 1" if stop_on_error else "echo $c"
+    script = (f'for c in "$@"; do echo {value} '
+              f'> /sys/devices/system/cpu/cpu$c/online || {{ {on_fail}; }}; done')
+    ret = subprocess.run(["sudo", "sh", "-c", script, "sh", *map(str, cpus)],
+                         capture_output=True, text=True)
+    failed = ret.stdout.split()
+    if failed:
+        return int(failed[0])
+    # sudo ITSELF FAILED BEFORE THE LOOP RAN
+    return cpus[0] if ret.returncode != 0 else None
+
+
 def restrict_cpus(count: int, max_cpus: int) -> bool:
-    for cpu in range(count, max_cpus):
-        if not set_cpu_online(cpu, False):
-            log_warn(f"Failed to offline CPU {cpu}")
-            return False
+    cpu = _set_cpus_online(range(count, max_cpus), False, stop_on_error=True)
+    if cpu is not None:
+        log_warn(f"Failed to offline CPU {cpu}")
+        return False
     return True
 
 
 def restore_all_cpus(max_cpus: int):
-    for cpu in range(1, max_cpus):
-        set_cpu_online(cpu, True)
+    _set_cpus_online(range(1, max_cpus), True, stop_on_error=False)
 
 
 class CpuGuard:
@@ -350,36 +938,143 @@ def scx_scheduler_name() -> str:
         return ""
 
 
+class _ScxOpsReader:
+    """Reusable read handle on SCX_OPS for polling loops.
+
+    Keeps one fd and pread()s it at offset 0, so a poll is one syscall
+    instead of open+read+close. root/ (and ops with it) is removed when a
+    scheduler detaches; a read on the stale fd fails, and the file is
+    reopened on the spot.
+    """
+
+    def __init__(self):
+        self.fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def name(self) -> str:
+        for _ in range(2):
+            if self.fd is None:
+                try:
+                    self.fd = os.open(SCX_OPS, os.O_RDONLY | os.O_CLOEXEC)
+                except OSError:
+                    return ""
+            try:
+                return os.pread(self.fd, 256, 0).strip().decode(errors="replace")
+            except OSError:
+                self.close()
+        return ""
+
+
+# INOTIFY (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_SCX_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CREATE | _IN_DELETE
+
+
+def _scx_inotify_open() -> int | None:
+    """Return an inotify fd watching sched_ext sysfs, or None if unavailable.
+
+    Watches the ops file and its parent directories, since root/ comes and
+    goes with the attached scheduler.
+    """
+    # DEFERRED: ONLY THE sched_ext WAIT LOOPS GET HERE, NOT build/status/clean
+    import ctypes
+    import ctypes.util
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6",
+                           use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    watched = 0
+    for path in (SCX_OPS, SCX_OPS.parent, SCX_OPS.parent.parent):
+        if libc.inotify_add_watch(fd, str(path).encode(), _SCX_WATCH_MASK) >= 0:
+            watched += 1
+    if not watched:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _scx_wait_event(fd: int | None, timeout: float) -> None:
+    """Block until a sched_ext sysfs event arrives or timeout elapses.
+
+    sysfs does not raise inotify events for every attribute change, so
+    callers keep a short timeout as a polling backstop. Falls back to a
+    plain sleep when inotify is unavailable.
+    """
+    if fd is None:
+        time.sleep(timeout)
+        return
+    ready, _, _ = select.select([fd], [], [], timeout)
+    if ready:
+        try:
+            os.read(fd, 4096)
+        except BlockingIOError:
+            pass
+
+
 def wait_for_activation(timeout: float = 10.0) -> bool:
-    deadline = time.monotonic() + timeout
-    while time.monotonic() < deadline:
-        if is_scx_active():
-            return True
-        time.sleep(0.1)
-    return False
+    # INTEGER NANOSECONDS: THE POLL LOOP COMPARES INTS, NO FLOAT PER CHECK
+    deadline = time.monotonic_ns() + int(timeout * 1e9)
+    fd = _scx_inotify_open()
+    try:
+        with _ScxOpsReader() as ops:
+            while True:
+                if ops.name():
+                    return True
+                remaining = deadline - time.monotonic_ns()
+                if remaining <= 0:
+                    return False
+                _scx_wait_event(fd, min(0.1, remaining / 1e9))
+    finally:
+        if fd is not None:
+            os.close(fd)
 
 
 def wait_for_deactivation(timeout: float = 5.0) -> bool:
-    deadline = time.monotonic() + timeout
-    while time.monotonic() < deadline:
-        if not is_scx_active():
-            return True
-        time.sleep(0.2)
-    return False
+    deadline = time.monotonic_ns() + int(timeout * 1e9)
+    fd = _scx_inotify_open()
+    try:
+        with _ScxOpsReader() as ops:
+            while True:
+                if not ops.name():
+                    return True
+                remaining = deadline - time.monotonic_ns()
+                if remaining <= 0:
+                    return False
+                _scx_wait_event(fd, min(0.2, remaining / 1e9))
+    finally:
+        if fd is not None:
+            os.close(fd)
 
 
 def wait_for_no_scheduler(timeout: float = 10.0) -> bool:
     """Wait until no sched_ext scheduler is registered (stale struct_ops detection)."""
     deadline = time.monotonic() + timeout
-    while time.monotonic() < deadline:
-        try:
-            name = SCX_OPS.read_text().strip()
+    with _ScxOpsReader() as ops:
+        while time.monotonic() < deadline:
+            name = ops.name()
             if not name:
                 return True
             log_info(f"  waiting for scheduler cleanup: '{name}' still registered")
-        except (FileNotFoundError, PermissionError):
-            return True
-        time.sleep(0.5)
+            time.sleep(0.5)
     log_warn("scheduler still registered after timeout")
     return False
 
@@ -1,10 +1,15 @@
+use std::fmt::Write as _;
 use std::fs::{self, File};
+use std::io::{BufRead, BufReader};
 use std::os::unix::process::CommandExt;
-use std::process::{Command, Stdio};
+use std::path::Path;
+use std::process::{Child, Command, Stdio};
+use std::sync::{Arc, Condvar, Mutex, OnceLock};
 use std::time::{Duration, Instant};
 
 use anyhow::{bail, Result};
 use clap::ValueEnum;
+use regex::Regex;
 
 use super::child_guard::ChildGuard;
 use super::report::{format_delta, format_latency_delta, mean_stdev, percentile, save_report};
@@ -84,11 +89,49 @@ pub fn run_bench_run(
     Ok(())
 }
 
+// CHARACTERS THAT NEED A REAL SHELL TO INTERPRET
+const SHELL_META: &[char] = &[
+    '|', '&', ';', '<', '>', '(', ')', '$', '`', '\\', '"', '\'', '*', '?', '[', '#', '~', '{',
+    '\n',
+];
+
+// PLAIN "VAR=val ... prog arg ..." COMMANDS ARE EXEC'D DIRECTLY, SAVING A
+// /bin/sh FORK+EXEC PER ITERATION. ANYTHING FANCIER STILL GOES THROUGH sh -c.
+fn command_for(cmd: &str) -> Command {
+    if cmd.contains(SHELL_META) {
+        let mut c = Command::new("sh");
+        c.args(["-c", cmd]);
+        return c;
+    }
+    let mut words = cmd.split_whitespace().peekable();
+    let mut env = Vec::new();
+    while let Some(&w) = words.peek() {
+        match w.split_once('=') {
+            Some((k, v))
+                if !k.is_empty()
+                    && !k.starts_with(|c: char| c.is_ascii_digit())
+                    && k.chars().all(|c| c.is_ascii_alphanumeric() || c == '_') =>
+            {
+                env.push((k, v));
+                words.next();
+            }
+            _ => break,
+        }
+    }
+    let Some(prog) = words.next() else {
+        let mut c = Command::new("sh");
+        c.args(["-c", cmd]);
+        return c;
+    };
+    let mut c = Command::new(prog);
+    c.args(words).envs(env);
+    c
+}
+
 fn timed_run(cmd: &str) -> Option<f64> {
     log_info!("Running: {}", cmd);
     let start = Instant::now();
-    let result = Command::new("sh")
-        .args(["-c", cmd])
+    let result = command_for(cmd)
         .stdout(Stdio::null())
         .stderr(Stdio::piped())
         .output();
@@ -166,6 +209,18 @@ pub fn run_bench(
     }
 }
 
+// "1.23s, 4.56s, ..." FORMATTED STRAIGHT INTO ONE STRING
+fn fmt_runs(times: &[f64]) -> String {
+    let mut out = String::with_capacity(times.len() * 8);
+    for (i, t) in times.iter().enumerate() {
+        if i > 0 {
+            out.push_str(", ");
+        }
+        let _ = write!(out, "{:.2}s", t);
+    }
+    out
+}
+
 // A/B BENCHMARK: EEVDF VS PANDEMONIUM (GENERIC)
 fn bench_general(
     cmd: &str,
@@ -191,7 +246,7 @@ fn bench_general(
     for i in 0..iterations {
         log_info!("Iteration {}/{}", i + 1, iterations);
         if let Some(cc) = clean_cmd {
-            let _ = Command::new("sh").args(["-c", cc]).output();
+            let _ = command_for(cc).output();
         }
         match timed_run(cmd) {
             Some(t) => eevdf_times.push(t),
@@ -209,7 +264,7 @@ fn bench_general(
     for i in 0..iterations {
         log_info!("Iteration {}/{}", i + 1, iterations);
         if let Some(cc) = clean_cmd {
-            let _ = Command::new("sh").args(["-c", cc]).output();
+            let _ = command_for(cc).output();
         }
         match timed_run(cmd) {
             Some(t) => pand_times.push(t),
@@ -245,82 +300,130 @@ fn bench_general(
         "EEVDF:       {:.2}s +/- {:.2}s",
         eevdf_mean, eevdf_std
     ));
-    report.push(format!(
-        "  RUNS: {}",
-        eevdf_times
-            .iter()
-            .map(|t| format!("{:.2}s", t))
-            .collect::<Vec<_>>()
-            .join(", ")
-    ));
+    report.push(format!("  RUNS: {}", fmt_runs(&eevdf_times)));
     report.push(format!(
         "PANDEMONIUM: {:.2}s +/- {:.2}s",
         pand_mean, pand_std
     ));
-    report.push(format!(
-        "  RUNS: {}",
-        pand_times
-            .iter()
-            .map(|t| format!("{:.2}s", t))
-            .collect::<Vec<_>>()
-            .join(", ")
-    ));
+    report.push(format!("  RUNS: {}", fmt_runs(&pand_times)));
     report.push(String::new());
     report.push(format_delta(delta_pct, "BUILD"));
     report.push(sep.clone());
 
     let report_text = report.join("\n") + "\n";
-    for line in &report {
-        println!("{}", line);
-    }
+    print!("{}", report_text);
 
     let path = save_report(&report_text, "benchmark")?;
     println!("\nSAVED TO {}", path);
     Ok(())
 }
 
-// PW-TOP SNAPSHOT: CAPTURE PIPEWIRE XRUN COUNTS
-fn pw_top_snapshot() -> Vec<(String, i64)> {
-    let mut child = match Command::new("pw-top")
-        .arg("-b")
-        .stdout(Stdio::piped())
-        .stderr(Stdio::null())
-        .spawn()
-    {
-        Ok(c) => c,
-        Err(_) => return Vec::new(),
-    };
+// PW-TOP STREAM: PIPEWIRE XRUN COUNTS FOR THE WHOLE MIXED BENCH
+// ONE LONG-LIVED pw-top -b; A READER THREAD KEEPS THE LAST COMPLETE FRAME
+// (HEADER TO NEXT HEADER). A SNAPSHOT RETURNS THAT FRAME AT ONCE AND ONLY
+// BLOCKS BEFORE THE FIRST FRAME HAS ARRIVED; TWO FRAME PERIODS PLUS SLACK
+// BOUND THAT WAIT.
+const PW_TOP_DEADLINE: Duration = Duration::from_millis(2500);
 
-    std::thread::sleep(Duration::from_millis(1500));
-    let _ = child.kill();
-    let output = match child.wait_with_output() {
-        Ok(o) => o,
-        Err(_) => return Vec::new(),
-    };
+fn is_pw_top_header(line: &str) -> bool {
+    line.starts_with("S ") && line.contains(" ID ")
+}
 
-    let stdout = String::from_utf8_lossy(&output.stdout);
-    let mut entries = Vec::new();
-    for line in stdout.lines() {
-        let line = line.trim();
-        if line.is_empty() || line.starts_with("S ") {
-            continue;
-        }
-        let parts: Vec<&str> = line.split_whitespace().collect();
-        if parts.len() < 10 {
-            continue;
-        }
-        if !matches!(parts[0], "R" | "S" | "C") {
-            continue;
+// NODE ROW: S ID QUANT RATE WAIT BUSY W/Q B/Q ERR REST... STATE IS R/S/C,
+// ERR IS THE 9TH COLUMN, THE NAME IS EVERYTHING AFTER IT
+fn pw_top_line() -> &'static Regex {
+    static RE: OnceLock<Regex> = OnceLock::new();
+    RE.get_or_init(|| Regex::new(r"^[RSC](?:\s+\S+){7}\s+(\d+)\s+(.+?)\s*$").unwrap())
+}
+
+fn parse_pw_top_row(line: &str) -> Option<(String, i64)> {
+    let caps = pw_top_line().captures(line)?;
+    let err = caps[1].parse::<i64>().ok()?;
+    Some((caps[2].trim_start_matches(['+', ' ']).to_string(), err))
+}
+
+#[derive(Default)]
+struct PwFrames {
+    started: u64,
+    done: u64,
+    closed: bool,
+    latest: Vec<(String, i64)>,
+}
+
+struct PwTop {
+    child: Option<Child>,
+    frames: Arc<(Mutex<PwFrames>, Condvar)>,
+}
+
+impl PwTop {
+    fn spawn() -> Self {
+        let frames = Arc::new((Mutex::new(PwFrames::default()), Condvar::new()));
+        let child = Command::new("pw-top")
+            .arg("-b")
+            .stdout(Stdio::piped())
+            .stderr(Stdio::null())
+            .spawn();
+        let Ok(mut child) = child else {
+            frames.0.lock().unwrap().closed = true;
+            return Self {
+                child: None,
+                frames,
+            };
+        };
+
+        let stdout = child.stdout.take().unwrap();
+        let shared = Arc::clone(&frames);
+        std::thread::spawn(move || {
+            let (lock, cv) = &*shared;
+            let mut rows = Vec::new();
+            let mut seq = 0;
+            for line in BufReader::new(stdout).lines() {
+                let Ok(line) = line else { break };
+                let line = line.trim();
+                if is_pw_top_header(line) {
+                    let mut f = lock.lock().unwrap();
+                    if seq > 0 {
+                        f.latest = std::mem::take(&mut rows);
+                        f.done = seq;
+                    }
+                    f.started += 1;
+                    seq = f.started;
+                    cv.notify_all();
+                } else if seq > 0 {
+                    rows.extend(parse_pw_top_row(line));
+                }
+            }
+            lock.lock().unwrap().closed = true;
+            cv.notify_all();
+        });
+
+        Self {
+            child: Some(child),
+            frames,
         }
-        if let Ok(err) = parts[8].parse::<i64>() {
-            let name = parts[9..]
-                .join(" ")
-                .trim_start_matches(['+', ' '])
-                .to_string();
-            entries.push((name, err));
+    }
+
+    fn snapshot(&self) -> Vec<(String, i64)> {
+        let (lock, cv) = &*self.frames;
+        let f = lock.lock().unwrap();
+        let (f, _) = cv
+            .wait_timeout_while(f, PW_TOP_DEADLINE, |f| f.done == 0 && !f.closed)
+            .unwrap();
+        f.latest.clone()
+    }
+
+    fn xruns(&self) -> i64 {
+        self.snapshot().iter().map(|(_, err)| err).sum()
+    }
+}
+
+impl Drop for PwTop {
+    fn drop(&mut self) {
+        if let Some(child) = self.child.as_mut() {
+            let _ = child.kill();
+            let _ = child.wait();
         }
     }
-    entries
 }
 
 fn pw_audio_playing() -> bool {
@@ -331,10 +434,6 @@ fn pw_audio_playing() -> bool {
         .unwrap_or(false)
 }
 
-fn pw_get_xruns() -> i64 {
-    pw_top_snapshot().iter().map(|(_, err)| err).sum()
-}
-
 // MIXED BENCHMARK: COMPILE + AUDIO
 fn bench_mixed(sched_args: &[String]) -> Result<()> {
     let sep = "=".repeat(60);
@@ -344,7 +443,8 @@ fn bench_mixed(sched_args: &[String]) -> Result<()> {
         bail!("NO AUDIO PLAYING. START AUDIO PLAYBACK FIRST.");
     }
 
-    let entries = pw_top_snapshot();
+    let pw_top = PwTop::spawn();
+    let entries = pw_top.snapshot();
     log_info!("Active PipeWire nodes:");
     for (name, err) in &entries {
         log_info!("  {} (xruns: {})", name, err);
@@ -361,11 +461,11 @@ fn bench_mixed(sched_args: &[String]) -> Result<()> {
 
     // PHASE 1: EEVDF
     log_info!("Phase 1: EEVDF (default scheduler)");
-    let _ = Command::new("sh").args(["-c", &clean_cmd]).output();
-    let xruns_before = pw_get_xruns();
+    let _ = command_for(&clean_cmd).output();
+    let xruns_before = pw_top.xruns();
     log_info!("Xruns before: {}", xruns_before);
     let eevdf_time = timed_run(&build_cmd).ok_or_else(|| anyhow::anyhow!("BUILD FAILED"))?;
-    let xruns_after = pw_get_xruns();
+    let xruns_after = pw_top.xruns();
     let eevdf_xruns = xruns_after - xruns_before;
     log_info!("Xruns after: {} (delta: {})", xruns_after, eevdf_xruns);
 
@@ -375,8 +475,8 @@ fn bench_mixed(sched_args: &[String]) -> Result<()> {
 
     // PHASE 3: PANDEMONIUM
     log_info!("Phase 3: PANDEMONIUM");
-    let _ = Command::new("sh").args(["-c", &clean_cmd]).output();
-    let xruns_before = pw_get_xruns();
+    let _ = command_for(&clean_cmd).output();
+    let xruns_before = pw_top.xruns();
     log_info!("Xruns before: {}", xruns_before);
     let pand_time = match timed_run(&build_cmd) {
         Some(t) => t,
@@ -385,7 +485,7 @@ fn bench_mixed(sched_args: &[String]) -> Result<()> {
             bail!("BUILD FAILED");
         }
     };
-    let xruns_after = pw_get_xruns();
+    let xruns_after = pw_top.xruns();
     let pand_xruns = xruns_after - xruns_before;
     log_info!("Xruns after: {} (delta: {})", xruns_after, pand_xruns);
 
@@ -444,9 +544,7 @@ fn bench_mixed(sched_args: &[String]) -> Result<()> {
     report.push(sep.clone());
 
     let report_text = report.join("\n") + "\n";
-    for line in &report {
-        println!("{}", line);
-    }
+    print!("{}", report_text);
 
     let path = save_report(&report_text, "mixed")?;
     println!("\nSAVED TO {}", path);
@@ -454,6 +552,33 @@ fn bench_mixed(sched_args: &[String]) -> Result<()> {
 }
 
 // CONTENTION BENCHMARK: COMPILE + INTERACTIVE PROBE
+fn parse_probe_sample(line: &[u8]) -> Option<f64> {
+    let digits = line.trim_ascii();
+    if digits.is_empty() {
+        return None;
+    }
+    let mut v: i64 = 0;
+    for &b in digits {
+        if !b.is_ascii_digit() {
+            return None;
+        }
+        v = v.checked_mul(10)?.checked_add((b - b'0') as i64)?;
+    }
+    Some(v as f64)
+}
+
+// A PREVIOUS RUN'S COPY IS REUSED WHILE IT MATCHES IN SIZE AND IS NEWER
+// THAN THE RUNNING BINARY (fs::copy STAMPS THE COPY WITH THE COPY TIME)
+fn probe_copy_stale(src: &Path, copy: &Path) -> bool {
+    let (Ok(s), Ok(c)) = (fs::metadata(src), fs::metadata(copy)) else {
+        return true;
+    };
+    match (s.modified(), c.modified()) {
+        (Ok(sm), Ok(cm)) => s.len() != c.len() || sm >= cm,
+        _ => true,
+    }
+}
+
 fn bench_contention(sched_args: &[String]) -> Result<()> {
     let sep = "=".repeat(60);
     log_info!("PANDEMONIUM contention benchmark");
@@ -470,7 +595,9 @@ fn bench_contention(sched_args: &[String]) -> Result<()> {
     // WHICH CONTAINS THE VERY BINARY WE'RE RUNNING FROM
     std::fs::create_dir_all(super::LOG_DIR)?;
     let probe_exe = format!("{}/probe", super::LOG_DIR);
-    std::fs::copy(self_exe(), &probe_exe)?;
+    if probe_copy_stale(&self_exe(), Path::new(&probe_exe)) {
+        std::fs::copy(self_exe(), &probe_exe)?;
+    }
 
     let sched_args = sched_args.to_vec();
 
@@ -497,7 +624,7 @@ fn bench_contention(sched_args: &[String]) -> Result<()> {
         };
 
         // CLEAN BUILD
-        let _ = Command::new("sh").args(["-c", &clean_cmd]).output();
+        let _ = command_for(&clean_cmd).output();
 
         // START PROBE WITH DEATH PIPE + PROCESS GROUP
         let (death_read, death_write) = super::death_pipe::create_death_pipe()
@@ -524,8 +651,7 @@ fn bench_contention(sched_args: &[String]) -> Result<()> {
         // RUN BUILD
         log_info!("Building...");
         let build_start = Instant::now();
-        let build_result = Command::new("sh")
-            .args(["-c", &build_cmd])
+        let build_result = command_for(&build_cmd)
             .stdout(Stdio::null())
             .stderr(Stdio::piped())
             .output()?;
@@ -554,7 +680,6 @@ fn bench_contention(sched_args: &[String]) -> Result<()> {
         let probe_child = probe_guard.into_child();
         let probe_output = probe_child.wait_with_output()?;
         super::death_pipe::close_fd(death_write);
-        let probe_stdout = String::from_utf8_lossy(&probe_output.stdout);
 
         // STOP SCHEDULER IF RUNNING
         if let Some(ref mut p) = pand_proc {
@@ -562,12 +687,14 @@ fn bench_contention(sched_args: &[String]) -> Result<()> {
             log_info!("PANDEMONIUM stopped");
         }
 
-        // PARSE PROBE OUTPUT
-        let mut overshoots: Vec<f64> = probe_stdout
-            .lines()
-            .filter_map(|line| line.trim().parse::<f64>().ok())
+        // PARSE PROBE OUTPUT: INTEGER MICROSECONDS, ONE PER LINE. PARSED
+        // STRAIGHT FROM THE BYTES, NO INTERMEDIATE STRING
+        let mut overshoots: Vec<f64> = probe_output
+            .stdout
+            .split(|&b| b == b'\n')
+            .filter_map(parse_probe_sample)
             .collect();
-        overshoots.sort_by(|a, b| a.partial_cmp(b).unwrap());
+        overshoots.sort_unstable_by(f64::total_cmp);
 
         let n = overshoots.len();
         let med = percentile(&overshoots, 50.0);
@@ -635,9 +762,7 @@ fn bench_contention(sched_args: &[String]) -> Result<()> {
     report.push(sep.clone());
 
     let report_text = report.join("\n") + "\n";
-    for line in &report {
-        println!("{}", line);
-    }
+    print!("{}", report_text);
 
     let path = save_report(&report_text, "contention")?;
     println!("\nSAVED TO {}", path);
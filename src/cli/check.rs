@@ -1,4 +1,4 @@
-use std::io::Read;
+use std::io::{BufRead, BufReader};
 use std::path::Path;
 use std::process::Command;
 
@@ -56,13 +56,26 @@ fn check_kernel_config() -> bool {
             return true;
         }
     };
-    let mut decoder = flate2::read::GzDecoder::new(file);
-    let mut config = String::new();
-    if decoder.read_to_string(&mut config).is_err() {
-        log_warn!("/proc/config.gz unreadable (skipped)");
-        return true;
+    // STREAM THE DECOMPRESSED CONFIG AND STOP AT THE FIRST HIT
+    let mut reader = BufReader::new(flate2::read::GzDecoder::new(file));
+    let mut line = Vec::new();
+    let mut found = false;
+    loop {
+        line.clear();
+        match reader.read_until(b'\n', &mut line) {
+            Ok(0) => break,
+            Ok(_) => {
+                if line.starts_with(b"CONFIG_SCHED_CLASS_EXT=y") {
+                    found = true;
+                    break;
+                }
+            }
+            Err(_) => {
+                log_warn!("/proc/config.gz unreadable (skipped)");
+                return true;
+            }
+        }
     }
-    let found = config.contains("CONFIG_SCHED_CLASS_EXT=y");
     if found {
         log_info!("CONFIG_SCHED_CLASS_EXT=y found");
     } else {
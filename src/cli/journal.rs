@@ -0,0 +1,202 @@
+// KERNEL LOG ACCESS VIA libsystemd's SD-JOURNAL API
+// DLOPEN'D AT RUNTIME: NO LINK-TIME DEPENDENCY ON SYSTEMD, AND CALLERS
+// FALL BACK TO FORKING journalctl WHEN THE LIBRARY IS MISSING.
+
+use std::ffi::{c_char, c_int, c_void, CStr, CString};
+use std::sync::OnceLock;
+
+const SD_JOURNAL_LOCAL_ONLY: c_int = 1;
+
+type OpenFn = unsafe extern "C" fn(*mut *mut c_void, c_int) -> c_int;
+type CloseFn = unsafe extern "C" fn(*mut c_void);
+type AddMatchFn = unsafe extern "C" fn(*mut c_void, *const c_void, usize) -> c_int;
+type StepFn = unsafe extern "C" fn(*mut c_void) -> c_int;
+type GetCursorFn = unsafe extern "C" fn(*mut c_void, *mut *mut c_char) -> c_int;
+type CursorFn = unsafe extern "C" fn(*mut c_void, *const c_char) -> c_int;
+type GetDataFn =
+    unsafe extern "C" fn(*mut c_void, *const c_char, *mut *const c_void, *mut usize) -> c_int;
+type GetRealtimeFn = unsafe extern "C" fn(*mut c_void, *mut u64) -> c_int;
+
+struct Api {
+    open: OpenFn,
+    close: CloseFn,
+    add_match: AddMatchFn,
+    seek_tail: StepFn,
+    previous: StepFn,
+    next: StepFn,
+    get_cursor: GetCursorFn,
+    seek_cursor: CursorFn,
+    test_cursor: CursorFn,
+    get_data: GetDataFn,
+    get_realtime_usec: GetRealtimeFn,
+}
+
+fn api() -> Option<&'static Api> {
+    static API: OnceLock<Option<Api>> = OnceLock::new();
+    API.get_or_init(|| unsafe {
+        let lib = libc::dlopen(
+            c"libsystemd.so.0".as_ptr(),
+            libc::RTLD_NOW | libc::RTLD_LOCAL,
+        );
+        if lib.is_null() {
+            return None;
+        }
+        macro_rules! sym {
+            ($name:literal) => {{
+                let p = libc::dlsym(lib, $name.as_ptr());
+                if p.is_null() {
+                    return None;
+                }
+                std::mem::transmute::<*mut c_void, _>(p)
+            }};
+        }
+        Some(Api {
+            open: sym!(c"sd_journal_open"),
+            close: sym!(c"sd_journal_close"),
+            add_match: sym!(c"sd_journal_add_match"),
+            seek_tail: sym!(c"sd_journal_seek_tail"),
+            previous: sym!(c"sd_journal_previous"),
+            next: sym!(c"sd_journal_next"),
+            get_cursor: sym!(c"sd_journal_get_cursor"),
+            seek_cursor: sym!(c"sd_journal_seek_cursor"),
+            test_cursor: sym!(c"sd_journal_test_cursor"),
+            get_data: sym!(c"sd_journal_get_data"),
+            get_realtime_usec: sym!(c"sd_journal_get_realtime_usec"),
+        })
+    })
+    .as_ref()
+}
+
+/// Local journal handle filtered to kernel messages (_TRANSPORT=kernel).
+pub struct Journal {
+    api: &'static Api,
+    j: *mut c_void,
+}
+
+// sd-journal HANDLES ARE NOT THREAD-SAFE BUT MAY MOVE BETWEEN THREADS; THE
+// HANDLE IS OWNED, SO ONLY ONE THREAD EVER USES IT AT A TIME
+unsafe impl Send for Journal {}
+
+impl Journal {
+    pub fn open_kernel() -> Option<Self> {
+        let api = api()?;
+        let mut j = std::ptr::null_mut();
+        unsafe {
+            if (api.open)(&mut j, SD_JOURNAL_LOCAL_ONLY) < 0 {
+                return None;
+            }
+            let journal = Self { api, j };
+            let m = b"_TRANSPORT=kernel";
+            if (api.add_match)(j, m.as_ptr() as *const c_void, m.len()) < 0 {
+                return None;
+            }
+            Some(journal)
+        }
+    }
+
+    /// Cursor of the newest kernel entry (journalctl -k -n 1 --show-cursor).
+    pub fn tail_cursor(&mut self) -> Option<String> {
+        unsafe {
+            if (self.api.seek_tail)(self.j) < 0 || (self.api.previous)(self.j) <= 0 {
+                return None;
+            }
+            let mut raw: *mut c_char = std::ptr::null_mut();
+            if (self.api.get_cursor)(self.j, &mut raw) < 0 || raw.is_null() {
+                return None;
+            }
+            let cursor = CStr::from_ptr(raw).to_string_lossy().into_owned();
+            libc::free(raw as *mut c_void);
+            Some(cursor)
+        }
+    }
+
+    /// Kernel lines logged after `cursor` that satisfy `keep`, formatted
+    /// like journalctl's short output ("Mon DD HH:MM:SS HOST kernel: MSG").
+    pub fn lines_after(&mut self, cursor: &str, keep: impl Fn(&str) -> bool) -> Vec<String> {
+        let mut lines = Vec::new();
+        let c_cursor = match CString::new(cursor) {
+            Ok(c) => c,
+            Err(_) => return lines,
+        };
+        unsafe {
+            if (self.api.seek_cursor)(self.j, c_cursor.as_ptr()) < 0 {
+                return lines;
+            }
+            // SEEKING LANDS ON THE CURSOR ENTRY ITSELF; SKIP IT (--after-cursor)
+            if (self.api.next)(self.j) <= 0 {
+                return lines;
+            }
+            if (self.api.test_cursor)(self.j, c_cursor.as_ptr()) <= 0 {
+                self.push_current(&mut lines, &keep);
+            }
+            while (self.api.next)(self.j) > 0 {
+                self.push_current(&mut lines, &keep);
+            }
+        }
+        lines
+    }
+
+    // VALUE OF `name` IN THE CURRENT ENTRY, WITHOUT THE "NAME=" PREFIX. THE
+    // SLICE POINTS INTO THE JOURNAL MAPPING AND IS ONLY VALID UNTIL THE NEXT
+    // CALL ON THE HANDLE
+    unsafe fn field(&self, name: &CStr) -> Option<&[u8]> {
+        let mut data: *const c_void = std::ptr::null();
+        let mut len: usize = 0;
+        if (self.api.get_data)(self.j, name.as_ptr(), &mut data, &mut len) < 0 {
+            return None;
+        }
+        let field = std::slice::from_raw_parts(data as *const u8, len);
+        let prefix_len = name.to_bytes().len() + 1;
+        Some(field.get(prefix_len..).unwrap_or(field))
+    }
+
+    unsafe fn push_current(&mut self, lines: &mut Vec<String>, keep: &impl Fn(&str) -> bool) {
+        let Some(msg) = self.field(c"MESSAGE") else {
+            return;
+        };
+        let msg = String::from_utf8_lossy(msg).into_owned();
+        if !keep(&msg) {
+            return;
+        }
+        let mut usec: u64 = 0;
+        (self.api.get_realtime_usec)(self.j, &mut usec);
+        let stamp = short_stamp(usec);
+        // journalctl -o short: "STAMP HOST kernel: MSG" (HOST OMITTED IF UNSET)
+        let line = match self.field(c"_HOSTNAME") {
+            Some(host) => format!(
+                "{} {} kernel: {}",
+                stamp,
+                String::from_utf8_lossy(host),
+                msg
+            ),
+            None => format!("{} kernel: {}", stamp, msg),
+        };
+        lines.push(line);
+    }
+}
+
+impl Drop for Journal {
+    fn drop(&mut self) {
+        unsafe { (self.api.close)(self.j) }
+    }
+}
+
+// "Mon DD HH:MM:SS" IN LOCAL TIME, MATCHING journalctl -o short
+fn short_stamp(usec: u64) -> String {
+    const MONTHS: [&str; 12] = [
+        "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+    ];
+    unsafe {
+        let t = (usec / 1_000_000) as libc::time_t;
+        let mut tm: libc::tm = std::mem::zeroed();
+        libc::localtime_r(&t, &mut tm);
+        format!(
+            "{} {:02} {:02}:{:02}:{:02}",
+            MONTHS[tm.tm_mon.clamp(0, 11) as usize],
+            tm.tm_mday,
+            tm.tm_hour,
+            tm.tm_min,
+            tm.tm_sec
+        )
+    }
+}
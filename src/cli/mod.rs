@@ -2,11 +2,16 @@ pub mod bench;
 pub mod check;
 pub mod child_guard;
 pub mod death_pipe;
+pub mod journal;
 pub mod probe;
 pub mod report;
 pub mod run;
 pub mod stress;
 pub mod test_gate;
+
+use std::os::fd::{AsRawFd, FromRawFd, OwnedFd};
+use std::time::{Duration, Instant};
+
 pub const TARGET_DIR: &str = "/tmp/pandemonium-build";
 pub const LOG_DIR: &str = "/tmp/pandemonium";
 
@@ -24,13 +29,64 @@ pub fn is_scx_active() -> bool {
         .unwrap_or(false)
 }
 
+// INOTIFY ON THE SCHED_EXT SYSFS NODES (root/ COMES AND GOES WITH THE
+// ATTACHED SCHEDULER, SO ITS PARENTS ARE WATCHED TOO)
+fn scx_inotify_open() -> Option<OwnedFd> {
+    let fd = unsafe { libc::inotify_init1(libc::IN_NONBLOCK | libc::IN_CLOEXEC) };
+    if fd < 0 {
+        return None;
+    }
+    let fd = unsafe { OwnedFd::from_raw_fd(fd) };
+    let mask = libc::IN_MODIFY | libc::IN_ATTRIB | libc::IN_CREATE | libc::IN_DELETE;
+    let mut watched = 0;
+    for path in [
+        c"/sys/kernel/sched_ext/root/ops",
+        c"/sys/kernel/sched_ext/root",
+        c"/sys/kernel/sched_ext",
+    ] {
+        if unsafe { libc::inotify_add_watch(fd.as_raw_fd(), path.as_ptr(), mask) } >= 0 {
+            watched += 1;
+        }
+    }
+    (watched > 0).then_some(fd)
+}
+
+// BLOCK UNTIL A SYSFS EVENT OR THE TIMEOUT; PLAIN SLEEP WITHOUT INOTIFY
+fn scx_wait_event(fd: Option<&OwnedFd>, timeout: Duration) {
+    let Some(fd) = fd else {
+        std::thread::sleep(timeout);
+        return;
+    };
+    let mut pfd = libc::pollfd {
+        fd: fd.as_raw_fd(),
+        events: libc::POLLIN,
+        revents: 0,
+    };
+    unsafe {
+        if libc::poll(&mut pfd, 1, timeout.as_millis() as libc::c_int) > 0 {
+            let mut buf = [0u8; 4096];
+            libc::read(
+                fd.as_raw_fd(),
+                buf.as_mut_ptr() as *mut libc::c_void,
+                buf.len(),
+            );
+        }
+    }
+}
+
 pub fn wait_for_activation(timeout_secs: u64) -> bool {
-    let start = std::time::Instant::now();
-    while start.elapsed().as_secs() < timeout_secs {
+    let deadline = Instant::now() + Duration::from_secs(timeout_secs);
+    let fd = scx_inotify_open();
+    loop {
         if is_scx_active() {
             return true;
         }
-        std::thread::sleep(std::time::Duration::from_millis(100));
+        let remaining = deadline.saturating_duration_since(Instant::now());
+        if remaining.is_zero() {
+            return false;
+        }
+        // SYSFS DOES NOT SIGNAL EVERY ATTRIBUTE CHANGE: KEEP THE 100MS POLL
+        // AS A BACKSTOP
+        scx_wait_event(fd.as_ref(), remaining.min(Duration::from_millis(100)));
     }
-    false
 }
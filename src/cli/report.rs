@@ -22,16 +22,20 @@ pub fn save_report(content: &str, prefix: &str) -> Result<String> {
 }
 
 pub fn mean_stdev(values: &[f64]) -> (f64, f64) {
-    let n = values.len();
-    if n == 0 {
-        return (0.0, 0.0);
+    // WELFORD: ONE PASS, NUMERICALLY STABLE
+    let mut n = 0usize;
+    let mut m = 0.0f64;
+    let mut m2 = 0.0f64;
+    for &x in values {
+        n += 1;
+        let d = x - m;
+        m += d / n as f64;
+        m2 += d * (x - m);
     }
-    let m: f64 = values.iter().sum::<f64>() / n as f64;
-    if n == 1 {
+    if n < 2 {
         return (m, 0.0);
     }
-    let variance: f64 = values.iter().map(|x| (x - m).powi(2)).sum::<f64>() / (n - 1) as f64;
-    (m, variance.sqrt())
+    (m, (m2 / (n - 1) as f64).sqrt())
 }
 
 pub fn percentile(sorted_vals: &[f64], p: f64) -> f64 {
@@ -1,27 +1,53 @@
-use std::io::{BufRead, BufReader};
+use std::collections::VecDeque;
+use std::io::{ErrorKind, IoSlice, Read, Write};
 use std::os::unix::process::CommandExt;
 use std::path::Path;
 use std::process::{Command, Stdio};
+use std::sync::OnceLock;
 use std::time::Duration;
 
 use anyhow::{bail, Result};
+use regex::Regex;
 
+use super::journal::Journal;
 use super::{binary_path, LOG_DIR, TARGET_DIR};
 
+// KEEP ONLY THE TAIL OF CARGO'S STDERR FOR THE FAILURE MESSAGE; THE ERRORS
+// THAT MATTER ARE AT THE END, AND A NOISY BUILD NO LONGER GROWS MEMORY.
+const BUILD_ERR_TAIL: usize = 64 * 1024;
+
 fn build_scheduler() -> Result<()> {
     log_info!("Building PANDEMONIUM (release)...");
 
     let project_root = env!("CARGO_MANIFEST_DIR");
-    let output = Command::new("cargo")
+    let mut child = Command::new("cargo")
         .args(["build", "--release"])
         .env("CARGO_TARGET_DIR", TARGET_DIR)
         .current_dir(project_root)
         .stderr(Stdio::piped())
         .stdout(Stdio::null())
-        .output()?;
+        .spawn()?;
 
-    if !output.status.success() {
-        let stderr = String::from_utf8_lossy(&output.stderr);
+    let mut stderr = child.stderr.take().unwrap();
+    let mut tail: VecDeque<u8> = VecDeque::with_capacity(BUILD_ERR_TAIL);
+    let mut buf = [0u8; 16 * 1024];
+    loop {
+        let n = match stderr.read(&mut buf) {
+            Ok(0) => break,
+            Ok(n) => n,
+            Err(e) if e.kind() == ErrorKind::Interrupted => continue,
+            Err(_) => break,
+        };
+        let chunk = &buf[n.saturating_sub(BUILD_ERR_TAIL)..n];
+        let overflow = (tail.len() + chunk.len()).saturating_sub(BUILD_ERR_TAIL);
+        tail.drain(..overflow);
+        tail.extend(chunk);
+    }
+    let status = child.wait()?;
+
+    if !status.success() {
+        let (a, b) = tail.as_slices();
+        let stderr = String::from_utf8_lossy(&[a, b].concat()).into_owned();
         bail!("BUILD FAILED:\n{}", stderr);
     }
 
@@ -31,7 +57,18 @@ fn build_scheduler() -> Result<()> {
     Ok(())
 }
 
-fn capture_dmesg_cursor() -> Option<String> {
+// ONE CASE-INSENSITIVE SCAN PER LINE, WITHOUT A LOWERCASED COPY OF IT
+fn is_relevant(line: &str) -> bool {
+    static RE: OnceLock<Regex> = OnceLock::new();
+    RE.get_or_init(|| Regex::new(r"(?i)sched_ext|scx|pandemonium").unwrap())
+        .is_match(line)
+}
+
+fn capture_dmesg_cursor(journal: Option<&mut Journal>) -> Option<String> {
+    // SD-JOURNAL DIRECTLY; FORK journalctl ONLY WITHOUT libsystemd
+    if let Some(journal) = journal {
+        return journal.tail_cursor();
+    }
     let output = Command::new("journalctl")
         .args(["-k", "--no-pager", "-n", "1", "--show-cursor"])
         .output()
@@ -48,7 +85,10 @@ fn capture_dmesg_cursor() -> Option<String> {
     None
 }
 
-fn capture_dmesg_after(cursor: Option<&str>) -> String {
+fn capture_dmesg_after(journal: Option<&mut Journal>, cursor: Option<&str>) -> String {
+    if let (Some(journal), Some(c)) = (journal, cursor) {
+        return journal.lines_after(c, is_relevant).join("\n");
+    }
     let mut cmd = Command::new("journalctl");
     cmd.args(["-k", "--no-pager"]);
     if let Some(c) = cursor {
@@ -64,8 +104,7 @@ fn capture_dmesg_after(cursor: Option<&str>) -> String {
         if line.is_empty() || line.starts_with("-- ") {
             continue;
         }
-        let low = line.to_lowercase();
-        if low.contains("sched_ext") || low.contains("scx") || low.contains("pandemonium") {
+        if is_relevant(line) {
             relevant.push(line.to_string());
         }
     }
@@ -84,31 +123,32 @@ fn save_logs(
     let sched_path = format!("{}/run-{}.log", LOG_DIR, stamp);
     std::fs::write(&sched_path, scheduler_output)?;
 
+    let dmesg_text = if dmesg.is_empty() {
+        "(NO RELEVANT KERNEL MESSAGES)"
+    } else {
+        dmesg
+    };
     let dmesg_path = format!("{}/dmesg-{}.log", LOG_DIR, stamp);
-    std::fs::write(
-        &dmesg_path,
-        if dmesg.is_empty() {
-            "(NO RELEVANT KERNEL MESSAGES)\n"
-        } else {
-            dmesg
-        },
-    )?;
+    write_parts(&dmesg_path, &[dmesg_text.as_bytes(), b"\n"])?;
 
+    // THE REPORT IS GATHERED FROM THE EXISTING BUFFERS WITH writev(), NOT
+    // FORMATTED INTO A SECOND COPY OF THE SCHEDULER OUTPUT
     let report_path = format!("{}/report-{}.log", LOG_DIR, stamp);
-    let report = format!(
+    let header = format!(
         "PANDEMONIUM RUN -- {stamp}\n\
          EXIT CODE: {returncode}\n\n\
-         SCHEDULER OUTPUT\n\
-         {scheduler_output}\n\n\
-         KERNEL LOG (DMESG)\n\
-         {dmesg_text}\n",
-        dmesg_text = if dmesg.is_empty() {
-            "(NO RELEVANT KERNEL MESSAGES)"
-        } else {
-            dmesg
-        },
+         SCHEDULER OUTPUT\n"
     );
-    std::fs::write(&report_path, &report)?;
+    write_parts(
+        &report_path,
+        &[
+            header.as_bytes(),
+            scheduler_output.as_bytes(),
+            b"\n\nKERNEL LOG (DMESG)\n",
+            dmesg_text.as_bytes(),
+            b"\n",
+        ],
+    )?;
 
     let latest = format!("{}/latest.log", LOG_DIR);
     let _ = std::fs::remove_file(&latest);
@@ -117,6 +157,21 @@ fn save_logs(
     Ok((sched_path, dmesg_path, report_path))
 }
 
+fn write_parts(path: &str, parts: &[&[u8]]) -> std::io::Result<()> {
+    let mut file = std::fs::File::create(path)?;
+    let mut slices: Vec<IoSlice> = parts.iter().map(|p| IoSlice::new(p)).collect();
+    let mut bufs = &mut slices[..];
+    while !bufs.is_empty() {
+        match file.write_vectored(bufs) {
+            Ok(0) => return Err(ErrorKind::WriteZero.into()),
+            Ok(n) => IoSlice::advance_slices(&mut bufs, n),
+            Err(e) if e.kind() == ErrorKind::Interrupted => {}
+            Err(e) => return Err(e),
+        }
+    }
+    Ok(())
+}
+
 fn chrono_stamp() -> String {
     let output = Command::new("date").arg("+%Y%m%d-%H%M%S").output().ok();
     match output {
@@ -126,6 +181,11 @@ fn chrono_stamp() -> String {
 }
 
 pub fn run_start(observe: bool, sched_args: &[String]) -> Result<()> {
+    // OPEN THE KERNEL JOURNAL (dlopen + FILE MAPPING) WHILE CARGO BUILDS.
+    // THE CURSOR ITSELF IS STILL TAKEN RIGHT BEFORE THE SPAWN, SO NO
+    // SCHEDULER MESSAGE CAN LAND BEFORE IT
+    let journal_open = std::thread::spawn(Journal::open_kernel);
+
     // BUILD FIRST
     build_scheduler()?;
 
@@ -144,7 +204,12 @@ pub fn run_start(observe: bool, sched_args: &[String]) -> Result<()> {
     let full_cmd = format!("sudo {} {}", bin, cmd_args.join(" "));
     log_info!("Running: {}", full_cmd);
 
-    let cursor = capture_dmesg_cursor();
+    // THIS HANDLE ONLY TAKES THE CURSOR. IT NEVER PROCESSES INOTIFY EVENTS,
+    // SO IT WOULD NOT SEE A JOURNAL FILE CREATED MID-RUN (ROTATION, JOURNALD
+    // RESTART); THE AFTER-CAPTURE OPENS A FRESH ONE AND SEEKS BY CURSOR
+    let mut journal = journal_open.join().ok().flatten();
+    let cursor = capture_dmesg_cursor(journal.as_mut());
+    drop(journal);
 
     let mut child = Command::new("sudo")
         .arg(&bin)
@@ -154,30 +219,36 @@ pub fn run_start(observe: bool, sched_args: &[String]) -> Result<()> {
         .stderr(Stdio::piped())
         .spawn()?;
 
-    let stdout = child.stdout.take().unwrap();
-    let reader = BufReader::new(stdout);
-    let mut output_lines = Vec::new();
-
-    for line in reader.lines() {
-        match line {
-            Ok(l) => {
-                println!("{}", l);
-                output_lines.push(l);
-            }
+    // TEE IN 64K CHUNKS: ONE read() AND ONE write() PER CHUNK, NOT PER LINE
+    let mut stdout = child.stdout.take().unwrap();
+    let mut output = Vec::new();
+    let mut buf = vec![0u8; 64 * 1024];
+    let mut term = std::io::stdout().lock();
+    loop {
+        let n = match stdout.read(&mut buf) {
+            Ok(0) => break,
+            Ok(n) => n,
+            Err(e) if e.kind() == ErrorKind::Interrupted => continue,
             Err(_) => break,
-        }
+        };
+        let _ = term.write_all(&buf[..n]);
+        let _ = term.flush();
+        output.extend_from_slice(&buf[..n]);
     }
+    drop(term);
 
     let status = child.wait()?;
 
-    let scheduler_output = output_lines.join("\n");
+    // SAME SHAPE AS THE OLD LINE JOIN: NO TRAILING NEWLINE
+    let text = String::from_utf8_lossy(&output);
+    let scheduler_output = text.strip_suffix('\n').unwrap_or(&text).to_string();
     let returncode = status.code().unwrap_or(-1);
 
     log_info!("PANDEMONIUM exited with code {}", returncode);
 
     // BRIEF PAUSE FOR KERNEL LOG FLUSH
     std::thread::sleep(Duration::from_millis(200));
-    let dmesg = capture_dmesg_after(cursor.as_deref());
+    let dmesg = capture_dmesg_after(Journal::open_kernel().as_mut(), cursor.as_deref());
 
     // SAVE LOGS
     let (sched_path, dmesg_path, report_path) = save_logs(&scheduler_output, &dmesg, returncode)?;
@@ -186,10 +257,17 @@ pub fn run_start(observe: bool, sched_args: &[String]) -> Result<()> {
     if dmesg.is_empty() {
         log_info!("Kernel log: no relevant sched_ext messages");
     } else {
-        log_info!("Kernel log ({} lines):", dmesg.lines().count());
+        // INDENT INTO ONE BUFFER AND WRITE IT ONCE, NOT ONE println!() PER LINE
+        let mut block = String::with_capacity(dmesg.len() + dmesg.len() / 16 + 4);
+        let mut count = 0;
         for line in dmesg.lines() {
-            println!("  {}", line);
+            block.push_str("  ");
+            block.push_str(line);
+            block.push('\n');
+            count += 1;
         }
+        log_info!("Kernel log ({} lines):", count);
+        print!("{}", block);
     }
 
     match returncode {
@@ -217,20 +295,21 @@ pub fn run_dmesg() -> Result<()> {
     }
 
     let stdout = String::from_utf8_lossy(&output.stdout);
-    let mut found = false;
+    let mut block = String::new();
     for line in stdout.lines() {
         if line.is_empty() || line.starts_with("-- ") {
             continue;
         }
-        let low = line.to_lowercase();
-        if low.contains("sched_ext") || low.contains("scx") || low.contains("pandemonium") {
-            println!("{}", line);
-            found = true;
+        if is_relevant(line) {
+            block.push_str(line);
+            block.push('\n');
         }
     }
 
-    if !found {
+    if block.is_empty() {
         log_info!("No recent sched_ext/PANDEMONIUM kernel messages");
+    } else {
+        print!("{}", block);
     }
 
     Ok(())
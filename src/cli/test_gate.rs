@@ -1,18 +1,72 @@
-use std::process::Command;
+use std::process::{Command, Stdio};
 
 use anyhow::{bail, Result};
 
 use super::TARGET_DIR;
 
+// BUILD THE GATE TEST BINARY AS THE INVOKING USER AND RETURN ITS PATH.
+// RUNNING CARGO UNDER SUDO WOULD RE-RESOLVE THE GRAPH AS ROOT AND LEAVE
+// ROOT-OWNED LOCKS/FINGERPRINTS IN TARGET_DIR FOR THE NEXT USER BUILD.
+fn build_gate_binary(project_root: &str) -> Result<String> {
+    let out = Command::new("cargo")
+        .args([
+            "test",
+            "--test",
+            "gate",
+            "--release",
+            "--no-run",
+            "--message-format=json-render-diagnostics",
+        ])
+        .env("CARGO_TARGET_DIR", TARGET_DIR)
+        .current_dir(project_root)
+        .stderr(Stdio::inherit())
+        .output()?;
+
+    if !out.status.success() {
+        bail!("GATE TEST BUILD FAILED");
+    }
+
+    // COMPILER-ARTIFACT MESSAGES CARRY THE TEST EXECUTABLE PATH
+    const KEY: &str = "\"executable\":\"";
+    for line in String::from_utf8_lossy(&out.stdout).lines() {
+        if !line.contains("\"reason\":\"compiler-artifact\"") || !line.contains("\"name\":\"gate\"")
+        {
+            continue;
+        }
+        if let Some(start) = line.find(KEY) {
+            let rest = &line[start + KEY.len()..];
+            if let Some(end) = rest.find('"') {
+                return Ok(rest[..end].to_string());
+            }
+        }
+    }
+    bail!("GATE TEST BINARY NOT FOUND IN CARGO OUTPUT")
+}
+
+fn on_path(bin: &str) -> bool {
+    std::env::var_os("PATH")
+        .map(|paths| std::env::split_paths(&paths).any(|dir| dir.join(bin).is_file()))
+        .unwrap_or(false)
+}
+
 pub fn run_test_gate() -> Result<()> {
     let project_root = env!("CARGO_MANIFEST_DIR");
 
     log_info!("PANDEMONIUM test gate");
 
     // LAYER 1: UNIT TESTS (NO ROOT)
-    log_info!("Layer 1: Rust unit tests");
+    // THESE DON'T TOUCH SCHED_EXT, SO THEY CAN RUN FULLY PARALLEL. NEXTEST
+    // ALSO RUNS ACROSS TEST BINARIES, WHERE CARGO TEST RUNS THEM ONE BY ONE.
+    // THE CRATE HAS NO DOCTESTS, SO NOTHING IS LOST BY SKIPPING CARGO TEST.
+    let l1_args: &[&str] = if on_path("cargo-nextest") {
+        log_info!("Layer 1: Rust unit tests (nextest)");
+        &["nextest", "run", "--release"]
+    } else {
+        log_info!("Layer 1: Rust unit tests");
+        &["test", "--release"]
+    };
     let l1 = Command::new("cargo")
-        .args(["test", "--release"])
+        .args(l1_args)
         .env("CARGO_TARGET_DIR", TARGET_DIR)
         .current_dir(project_root)
         .status()?;
@@ -22,17 +76,16 @@ pub fn run_test_gate() -> Result<()> {
     }
 
     // LAYERS 2-5: INTEGRATION TESTS (REQUIRES ROOT)
+    // ONLY THE PREBUILT TEST BINARY RUNS ELEVATED; CARGO STAYS UNPRIVILEGED.
+    // STRICTLY SERIAL: ONLY ONE SCHED_EXT SCHEDULER CAN BE ATTACHED AT A
+    // TIME, SO GATE CASES CANNOT SHARE THE MACHINE.
     log_info!("Layers 2-5: integration (requires root)");
+    let gate = build_gate_binary(project_root)?;
     let l2 = Command::new("sudo")
         .args([
             "-E",
             &format!("CARGO_TARGET_DIR={}", TARGET_DIR),
-            "cargo",
-            "test",
-            "--test",
-            "gate",
-            "--release",
-            "--",
+            &gate,
             "--ignored",
             "--test-threads=1",
             "full_gate",
@@ -11,10 +11,11 @@ Usage:
 """
 
 import argparse
+import functools
 import os
 import threading
-import traceback
 import re
+import select
 import signal
 import shutil
 import subprocess
@@ -25,16 +26,18 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
 from pandemonium_common import (
-    SCRIPT_DIR, TARGET_DIR, LOG_DIR, ARCHIVE_DIR, BINARY, SOURCE_PATTERNS,
+    SCRIPT_DIR, TARGET_DIR, LOG_DIR, ARCHIVE_DIR, BINARY,
     get_version, get_git_info,
     log_info, log_warn, log_error, run_cmd,
-    has_root_owned_files, clean_root_files, check_sources_changed, build,
+    has_root_owned_files, clean_root_files, check_sources_changed,
+    source_newer_than_binary, remove_build_dir, build,
     SCX_OPS, is_scx_active, scx_scheduler_name,
     wait_for_activation, wait_for_deactivation, wait_for_no_scheduler,
     set_cpu_online, restrict_cpus, restore_all_cpus, CpuGuard,
     get_possible_cpus, get_online_cpus, compute_core_counts,
     mean_stdev, percentile,
     find_trace_pipe,
+    start_priv_helper, stop_priv_helper, priv_call, priv_stream, priv_alive,
 )
 
 
@@ -45,74 +48,210 @@ DEFAULT_EXTERNALS = ["scx_bpfland"]
 
 # DMESG MONITORING
 
+def _decode_line(line: bytes) -> str:
+    return line.strip().decode("utf-8", "replace")
+
+
 class DmesgMonitor:
     """Active crash detection via dmesg polling.
 
-    Snapshots dmesg at construction, .check() polls for crash patterns,
+    Records a kernel journal cursor at construction (falling back to a
+    dmesg line count without journald), .check() polls for crash patterns,
     .save() writes new lines to log file with keyword-filtered summary.
+    With skip, nothing is read at all (bench-scale --skip-dmesg).
     """
 
-    CRASH_PATTERNS = [
-        "failed to run for",
-        "runnable task stall",
-    ]
-    KEYWORDS = ["sched_ext", "pandemonium", "non-existent DSQ", "zero slice",
-                "panic", "BUG:", "RIP:", "Oops", "Call Trace"]
-
-    def __init__(self):
-        r = subprocess.run(["sudo", "dmesg"], capture_output=True, text=True)
-        self.baseline = len(r.stdout.splitlines()) if r.returncode == 0 else 0
+    # KERNEL LINES ARE SCANNED AS BYTES; ONLY LINES THAT GET LOGGED ARE DECODED
+    CRASH_PATTERNS = (
+        b"failed to run for",
+        b"runnable task stall",
+    )
+    # FILTER KEYWORDS AND SUMMARY CLASSES, FUSED INTO ONE SCAN PER LINE.
+    # "runtime error" COUNTS AS A CRASH BUT DOES NOT SELECT A LINE ON ITS OWN
+    _SCAN = re.compile(
+        rb"(?P<panic>panic|BUG:|RIP:)"
+        rb"|(?P<dsq>non-existent DSQ)"
+        rb"|(?P<rterr>runtime error)"
+        rb"|(?P<zero>zero slice)"
+        rb"|(?P<other>sched_ext|pandemonium|Oops|Call Trace)")
+
+    def __init__(self, skip: bool = False):
+        self.skip = skip
         self.crashed = False
         self.crash_msg = ""
+        self.cursor = None
+        self.baseline = 0
+        self._kmsg = None
+        if skip:
+            return
+        # /dev/kmsg POSITIONED AT THE END: WHILE A NON-BLOCKING READ STILL
+        # RETURNS EAGAIN NOTHING NEW WAS LOGGED AND NO READER NEEDS SPAWNING
+        self._kmsg = self._kmsg_open()
+        # A CURSOR LETS EVERY LATER READ STREAM ONLY THE NEW RECORDS INSTEAD
+        # OF RE-READING AND SPLITTING THE WHOLE RING BUFFER
+        self.cursor = self._journal_cursor()
+        if self.cursor is None:
+            reply = priv_call({"op": "dmesg_count"})
+            if reply is not None:
+                self.baseline = reply["count"]
+            else:
+                r = subprocess.run(["sudo", "dmesg"], capture_output=True)
+                self.baseline = r.stdout.count(b"\n") if r.returncode == 0 else 0
+
+    def __del__(self):
+        if self._kmsg is not None:
+            os.close(self._kmsg)
 
-    def _new_lines(self) -> list[str]:
-        r = subprocess.run(["sudo", "dmesg"], capture_output=True, text=True)
+    @staticmethod
+    def _kmsg_open() -> int | None:
+        try:
+            fd = os.open("/dev/kmsg", os.O_RDONLY | os.O_NONBLOCK | os.O_CLOEXEC)
+        except OSError:
+            # dmesg_restrict WITHOUT CAP_SYSLOG: NO SHORTCUT, ALWAYS READ
+            return None
+        try:
+            os.lseek(fd, 0, os.SEEK_END)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    def _has_new(self) -> bool:
+        """False only while /dev/kmsg shows no record since construction."""
+        if self._kmsg is None:
+            return True
+        try:
+            os.read(self._kmsg, 8192)
+        except BlockingIOError:
+            return False
+        except OSError:
+            # EPIPE: RECORDS WERE OVERWRITTEN, SO THERE WERE NEW ONES
+            pass
+        # GROWN ONCE MEANS GROWN FOR GOOD; STOP PROBING
+        os.close(self._kmsg)
+        self._kmsg = None
+        return True
+
+    @staticmethod
+    def _journal_cursor() -> str | None:
+        reply = priv_call({"op": "dmesg_cursor"})
+        if reply is not None:
+            return reply["cursor"]
+        try:
+            r = subprocess.run(
+                ["sudo", "journalctl", "--dmesg", "-n", "1", "--show-cursor",
+                 "--no-pager", "-q"],
+                capture_output=True, text=True)
+        except FileNotFoundError:
+            return None
         if r.returncode != 0:
-            return []
-        lines = r.stdout.splitlines()
-        return lines[self.baseline:] if self.baseline < len(lines) else []
+            return None
+        for line in reversed(r.stdout.splitlines()):
+            if line.startswith("-- cursor:"):
+                return line.split(":", 1)[1].strip()
+        return None
+
+    def _iter_new_lines(self):
+        """Yield kernel lines (bytes) logged since construction, one at a time.
+
+        Streams the reader's stdout instead of buffering the whole dump,
+        so memory stays flat however large the log is. Goes through the
+        privileged helper when one is running.
+        """
+        if self.skip or not self._has_new():
+            return
+        # LINES ALREADY YIELDED BEFORE A HELPER FAILURE; THE sudo REREAD
+        # SKIPS THEM SO NOTHING IS SEEN TWICE
+        seen = 0
+        if priv_alive():
+            try:
+                for line in priv_stream({"op": "dmesg_after",
+                                         "cursor": self.cursor,
+                                         "skip": self.baseline}):
+                    seen += 1
+                    yield line
+                return
+            except OSError as e:
+                log_warn(f"dmesg: {e}; rereading via sudo")
+        if self.cursor is not None:
+            cmd = ["sudo", "journalctl", "--dmesg", "--no-pager", "-q",
+                   "--after-cursor", self.cursor]
+            skip = 0
+        else:
+            cmd = ["sudo", "dmesg"]
+            skip = self.baseline
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL)
+        try:
+            for i, line in enumerate(proc.stdout):
+                if i < skip or line.startswith(b"-- "):
+                    continue
+                if seen:
+                    seen -= 1
+                    continue
+                yield line.rstrip(b"\n")
+        finally:
+            # AN EARLY EXIT CLOSES THE PIPE; THE READER DIES ON SIGPIPE
+            proc.stdout.close()
+            proc.wait()
 
     def check(self) -> bool:
         """Poll for crash patterns. Returns True if crash detected."""
-        for line in self._new_lines():
-            if "sched_ext" in line:
-                log_info(f"  dmesg: {line.strip()}")
+        for line in self._iter_new_lines():
+            if b"sched_ext" in line:
+                log_info(f"  dmesg: {_decode_line(line)}")
             for pattern in self.CRASH_PATTERNS:
                 if pattern in line:
                     self.crashed = True
-                    self.crash_msg = line.strip()
+                    self.crash_msg = _decode_line(line)
                     return True
-            if "disabled" in line and "sched_ext" in line:
+            if b"disabled" in line and b"sched_ext" in line:
                 self.crashed = True
-                self.crash_msg = line.strip()
+                self.crash_msg = _decode_line(line)
                 return True
         return False
 
     def save(self, stamp: str | None = None) -> None:
         """Save new dmesg lines to log file, print keyword-filtered summary."""
-        new_lines = self._new_lines()
-        if not new_lines:
-            log_info("dmesg: no new kernel messages")
-            return
-
         if stamp is None:
             stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        LOG_DIR.mkdir(parents=True, exist_ok=True)
         dmesg_path = LOG_DIR / f"dmesg-{stamp}.log"
-        dmesg_path.write_text("\n".join(new_lines) + "\n")
 
-        filtered = [l for l in new_lines
-                    if any(kw in l for kw in self.KEYWORDS)]
+        # WRITE AND CLASSIFY AS LINES ARRIVE; THE FILE IS ONLY CREATED ONCE
+        # THERE IS SOMETHING TO PUT IN IT
+        out = None
+        count = 0
+        filtered = []
+        crashes = zero_slices = panics = 0
+        try:
+            for l in self._iter_new_lines():
+                if out is None:
+                    LOG_DIR.mkdir(parents=True, exist_ok=True)
+                    out = open(dmesg_path, "wb")
+                out.write(l + b"\n")
+                count += 1
+                kinds = {m.lastgroup for m in self._SCAN.finditer(l)}
+                if not kinds - {"rterr"}:
+                    continue
+                filtered.append(l)
+                crashes += bool(kinds & {"dsq", "rterr"})
+                zero_slices += "zero" in kinds
+                panics += "panic" in kinds
+        finally:
+            if out is not None:
+                out.close()
+
+        if self.skip:
+            log_info("dmesg: capture skipped (--skip-dmesg)")
+            return
 
-        if not filtered:
-            log_info(f"dmesg: {len(new_lines)} messages, no scheduler issues")
+        if not count:
+            log_info("dmesg: no new kernel messages")
             return
 
-        crashes = sum(1 for l in filtered
-                      if "non-existent DSQ" in l or "runtime error" in l)
-        zero_slices = sum(1 for l in filtered if "zero slice" in l)
-        panics = sum(1 for l in filtered
-                     if "panic" in l or "BUG:" in l or "RIP:" in l)
+        if not filtered:
+            log_info(f"dmesg: {count} messages, no scheduler issues")
+            return
 
         if panics:
             log_error(f"dmesg: KERNEL PANIC/BUG -- see {dmesg_path}")
@@ -122,9 +261,9 @@ class DmesgMonitor:
             log_warn(f"dmesg: {zero_slices} zero-slice warning(s)")
 
         for line in filtered:
-            log_info(f"  {line.strip()}")
+            log_info(f"  {_decode_line(line)}")
 
-        log_info(f"dmesg: {len(new_lines)} messages saved to {dmesg_path}")
+        log_info(f"dmesg: {count} messages saved to {dmesg_path}")
 
 
 # TRACE CAPTURE
@@ -268,40 +407,44 @@ def restore_bpf_source(original: str):
     log_info("Restored main.bpf.c")
 
 
-def fix_ownership():
+def start_fix_ownership() -> list[subprocess.Popen]:
+    """Start chown -R on the build and log dirs concurrently; returns the procs."""
     uid = os.environ.get("SUDO_UID", str(os.getuid()))
     gid = os.environ.get("SUDO_GID", str(os.getgid()))
     log_info(f"Fixing ownership to {uid}:{gid}...")
-    for d in [TARGET_DIR, LOG_DIR]:
-        if d.exists():
-            subprocess.run(
-                ["chown", "-R", f"{uid}:{gid}", str(d)],
-                capture_output=True,
-            )
+    return [
+        subprocess.Popen(["chown", "-R", f"{uid}:{gid}", str(d)],
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for d in [TARGET_DIR, LOG_DIR] if d.exists()
+    ]
+
+
+def fix_ownership():
+    for proc in start_fix_ownership():
+        proc.wait()
 
 
 def nuke_stale_build():
     """Nuke the build dir if any source file is newer than the binary."""
     if not TARGET_DIR.exists():
         return
-    if not BINARY.exists():
+    # ONE STAT OF THE BINARY, SHARED WITH THE SOURCE WALK
+    try:
+        bin_mtime_ns = BINARY.stat().st_mtime_ns
+    except FileNotFoundError:
         log_info(f"Nuking build directory (no binary): {TARGET_DIR}")
-        subprocess.run(["sudo", "rm", "-rf", str(TARGET_DIR)],
-                       capture_output=True)
+        remove_build_dir()
         return
-    bin_mtime = BINARY.stat().st_mtime
-    for pattern in SOURCE_PATTERNS:
-        for src in SCRIPT_DIR.glob(pattern):
-            if src.stat().st_mtime > bin_mtime:
-                log_warn(f"Source changed: {src.relative_to(SCRIPT_DIR)}")
-                log_info(f"Nuking stale build directory: {TARGET_DIR}")
-                subprocess.run(["sudo", "rm", "-rf", str(TARGET_DIR)],
-                               capture_output=True)
-                return
+    src = source_newer_than_binary(bin_mtime_ns=bin_mtime_ns)
+    if src:
+        log_warn(f"Source changed: {src}")
+        log_info(f"Nuking stale build directory: {TARGET_DIR}")
+        remove_build_dir()
 
 
 # SCHEDULER PROCESS MANAGEMENT
 
+@functools.cache
 def find_scheduler(name: str) -> str | None:
     return shutil.which(name)
 
@@ -311,25 +454,44 @@ class SchedulerProcess:
 
     def __init__(self, proc: subprocess.Popen, name: str,
                  stdout_path: str | None = None,
-                 stderr_path: str | None = None):
+                 stderr_path: str | None = None,
+                 stderr_fd: int | None = None):
         self.proc = proc
         self.name = name
         self.pgid = os.getpgid(proc.pid)
         self.stdout_path = stdout_path
         self.stderr_path = stderr_path
+        self.stderr_fd = stderr_fd
+        # A PIDFD BECOMES READABLE THE MOMENT THE CHILD EXITS, SO stop()
+        # WAKES ON EXIT INSTEAD OF SLEEP-POLLING (LINUX 5.3+)
+        try:
+            self.pidfd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError):
+            self.pidfd = None
+
+    def _wait_exit(self, timeout: float) -> bool:
+        """Wait up to timeout for the process to exit; True if it has."""
+        if self.pidfd is not None:
+            select.select([self.pidfd], [], [], timeout)
+            return self.proc.poll() is not None
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                return True
+            time.sleep(0.05)
+        return self.proc.poll() is not None
 
     def stop(self):
         if self.proc.poll() is not None:
             return
+        # SIGNALS STILL GO TO THE GROUP: THE SCHEDULER RUNS UNDER sudo, WHICH
+        # THIS PROCESS CANNOT SIGNAL BY PIDFD ONCE IT HAS CHANGED UID
         try:
             os.killpg(self.pgid, signal.SIGINT)
         except ProcessLookupError:
             return
-        deadline = time.monotonic() + 3.0
-        while time.monotonic() < deadline:
-            if self.proc.poll() is not None:
-                return
-            time.sleep(0.05)
+        if self._wait_exit(3.0):
+            return
         try:
             os.killpg(self.pgid, signal.SIGKILL)
         except ProcessLookupError:
@@ -346,6 +508,11 @@ class SchedulerProcess:
         return ""
 
     def read_stderr(self, limit: int = 4000) -> str:
+        if self.stderr_fd is not None:
+            try:
+                return os.pread(self.stderr_fd, limit, 0).decode(errors="replace")
+            except OSError:
+                return ""
         if self.stderr_path:
             try:
                 return Path(self.stderr_path).read_text()[:limit]
@@ -353,7 +520,43 @@ class SchedulerProcess:
                 pass
         return ""
 
+    def archive_stderr(self) -> Path | None:
+        """Copy the full memfd stderr to LOG_DIR (failure post-mortems).
+
+        sendfile moves the bytes memfd -> file inside the kernel: no
+        userspace buffer however large the verifier dump. Successful runs
+        never call this, so their stderr never touches storage.
+        """
+        if self.stderr_fd is None:
+            return None
+        try:
+            size = os.fstat(self.stderr_fd).st_size
+        except OSError:
+            return None
+        if not size:
+            return None
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = LOG_DIR / f"sched-{self.name}-{stamp}.stderr"
+        try:
+            with open(path, "wb") as out:
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(out.fileno(), self.stderr_fd,
+                                       offset, size - offset)
+                    if not sent:
+                        break
+                    offset += sent
+        except OSError:
+            return None
+        return path
+
     def cleanup(self):
+        if self.stderr_fd is not None:
+            os.close(self.stderr_fd)
+            self.stderr_fd = None
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+            self.pidfd = None
         for p in [self.stdout_path, self.stderr_path]:
             if p:
                 try:
@@ -366,9 +569,10 @@ class SchedulerProcess:
         self.cleanup()
 
 
-def start_scheduler(cmd: list[str], name: str) -> SchedulerProcess | None:
+def start_scheduler(cmd: list[str] | tuple[str, ...],
+                    name: str) -> SchedulerProcess | None:
     """Spawn a scheduler subprocess in its own process group.
-    Stdout and stderr go to files to avoid pipe buffer overflow.
+    Stdout goes to a file and stderr to a memfd to avoid pipe buffer overflow.
     Returns None if the binary cannot be found."""
     bin_path = cmd[0] if cmd else ""
     if bin_path and not os.path.exists(bin_path) and not shutil.which(bin_path):
@@ -376,25 +580,35 @@ def start_scheduler(cmd: list[str], name: str) -> SchedulerProcess | None:
         return None
     # Refresh sudo credentials before spawning (bench-scale runs are long)
     subprocess.run(["sudo", "-v"], capture_output=True)
-    full_cmd = ["sudo"] + cmd
+    full_cmd = ["sudo", *cmd]
     log_info(f"Starting: {' '.join(full_cmd)}")
     LOG_DIR.mkdir(parents=True, exist_ok=True)
     stdout_path = str(LOG_DIR / f"sched-{name}-{os.getpid()}.stdout")
     stdout_f = open(stdout_path, "w")
-    stderr_path = str(LOG_DIR / f"sched-{name}-{os.getpid()}.stderr")
-    stderr_f = open(stderr_path, "w")
+    # STDERR (VERIFIER DUMPS CAN RUN TO MEGABYTES) LIVES IN A MEMFD: NO DISK
+    # WRITES DURING MEASUREMENT, AND IT IS ONLY EVER READ BACK IN-PROCESS
+    stderr_path = None
+    try:
+        stderr_fd = os.memfd_create(f"sched-{name}-stderr", os.MFD_CLOEXEC)
+    except (AttributeError, OSError):
+        stderr_fd = None
+        stderr_path = str(LOG_DIR / f"sched-{name}-{os.getpid()}.stderr")
+    stderr_f = open(stderr_path, "w") if stderr_path else None
     proc = subprocess.Popen(
         full_cmd,
         stdout=stdout_f,
-        stderr=stderr_f,
-        preexec_fn=os.setpgrp,
+        stderr=stderr_f if stderr_f else stderr_fd,
+        # process_group INSTEAD OF preexec_fn=os.setpgrp: NO PYTHON CODE IN THE
+        # CHILD, SO CPython CAN vfork() RATHER THAN COPY OUR PAGE TABLES
+        process_group=0,
     )
     stdout_f.close()
-    stderr_f.close()
-    return SchedulerProcess(proc, name, stdout_path, stderr_path)
+    if stderr_f:
+        stderr_f.close()
+    return SchedulerProcess(proc, name, stdout_path, stderr_path, stderr_fd)
 
 
-def start_and_wait(cmd: list[str], name: str,
+def start_and_wait(cmd: list[str] | tuple[str, ...], name: str,
                    settle_secs: float = 2.0) -> SchedulerProcess | None:
     """Start a scheduler, wait for sched_ext activation. Returns None on failure."""
     # Detect stale struct_ops registration before starting
@@ -418,11 +632,14 @@ def start_and_wait(cmd: list[str], name: str,
             log_error(f"{name} process exited early (code {guard.proc.returncode})")
         else:
             log_warn(f"{name} process still running but sched_ext not active")
-        stderr = guard.read_stderr()
-        if stderr.strip():
-            for line in stderr.strip().splitlines()[:30]:
+        stderr = guard.read_stderr().strip()
+        if stderr:
+            for line in stderr.splitlines()[:30]:
                 log_error(f"  {line}")
         guard.stop()
+        saved = guard.archive_stderr()
+        if saved:
+            log_info(f"Full stderr saved to {saved}")
         wait_for_deactivation(5.0)
         return None
     log_info(f"{name} is active")
@@ -456,12 +673,16 @@ def measure_struct_ops_cleanup():
         time.sleep(0.01)
 
 
-def stop_and_wait(guard: SchedulerProcess | None) -> str:
-    """Stop a scheduler, wait for deactivation. Returns captured stdout."""
+def stop_and_wait(guard: SchedulerProcess | None, drain: bool = True) -> str:
+    """Stop a scheduler, wait for deactivation. Returns captured stdout.
+
+    drain=False skips reading the stdout file back (returns "") for callers
+    that already consume it incrementally.
+    """
     if guard is None:
         return ""
     guard.stop()
-    stdout = guard.drain_stdout()
+    stdout = guard.drain_stdout() if drain else ""
     if not wait_for_deactivation(5.0):
         log_warn(f"sched_ext still active after stopping {guard.name}")
     measure_struct_ops_cleanup()
@@ -471,31 +692,98 @@ def stop_and_wait(guard: SchedulerProcess | None) -> str:
 
 # MEASUREMENT
 
+# CHARACTERS THAT NEED A REAL SHELL TO INTERPRET
+_SHELL_META = set("|&;<>()$`\\\"'*?[#~{\n")
+
+
+@functools.lru_cache(maxsize=16)
+def _command_argv(cmd: str) -> tuple[tuple[str, ...], dict | None]:
+    """Split a plain `VAR=val ... prog arg ...` command for direct exec.
+
+    Saves a /bin/sh fork+exec per run. Anything using shell syntax still
+    goes through sh -c. Returns (argv, env), env None to inherit. Cached:
+    benchmark loops re-run the same commands, so the environment copy for
+    leading assignments is built once per command, not per iteration.
+    """
+    words = cmd.split()
+    if _SHELL_META.intersection(cmd) or not words:
+        return (shutil.which("sh") or "sh", "-c", cmd), None
+    assigns = {}
+    while words:
+        name, eq, value = words[0].partition("=")
+        if not (eq and name.isidentifier() and name.isascii()):
+            break
+        assigns[name] = value
+        words.pop(0)
+    if not words:
+        return (shutil.which("sh") or "sh", "-c", cmd), None
+    env = (os.environ | assigns) if assigns else None
+    # ABSOLUTE PROGRAM PATH: ONE OF THE CONDITIONS FOR CPython's posix_spawn
+    # FAST PATH (SEE timed_run)
+    prog = shutil.which(words[0], path=(env or os.environ).get("PATH"))
+    return (prog or words[0], *words[1:]), env
+
+
 def timed_run(cmd: str, clean_cmd: str | None = None) -> float | None:
     """Run a shell command, return wall-clock seconds or None on failure."""
+    # close_fds=False + AN ABSOLUTE PATH LET CPython posix_spawn() THE
+    # WORKLOAD: NO FORK OF THIS PROCESS AND NO CLOSE-EVERY-FD SWEEP INSIDE
+    # THE TIMED WINDOW. SAFE: PYTHON OPENS ITS OWN FDS NON-INHERITABLE
     if clean_cmd:
-        subprocess.run(["sh", "-c", clean_cmd],
+        argv, env = _command_argv(clean_cmd)
+        subprocess.run(argv, env=env, close_fds=False,
                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # ALL LOGGING STAYS OUTSIDE THE WINDOW, AND SO DOES THE WORKLOAD'S
+    # STDERR: IT LANDS IN A MEMFD READ ONLY ON FAILURE, RATHER THAN A PIPE
+    # THIS PROCESS WOULD BE DRAINING (cargo IS CHATTY) WHILE THE CLOCK RUNS
     log_info(f"Running: {cmd}")
-    start = time.monotonic()
-    result = subprocess.run(["sh", "-c", cmd],
-                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
-    elapsed = time.monotonic() - start
-    if result.returncode != 0:
-        stderr = result.stderr.decode(errors="replace")[:500]
-        log_error(f"Command failed (exit {result.returncode}): {stderr}")
-        return None
+    argv, env = _command_argv(cmd)
+    try:
+        err_fd = os.memfd_create("timed-run-stderr", os.MFD_CLOEXEC)
+    except (AttributeError, OSError):
+        err_fd = None
+    try:
+        # perf_counter_ns: AN INT STRAIGHT FROM THE CLOCK, NO FLOAT
+        # CONVERSION INSIDE THE MEASURED WINDOW
+        start_ns = time.perf_counter_ns()
+        try:
+            result = subprocess.run(
+                argv, env=env, close_fds=False, stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE if err_fd is None else err_fd)
+        except OSError as e:
+            log_error(f"Command failed: {e}")
+            return None
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+        if result.returncode != 0:
+            raw = result.stderr if err_fd is None else os.pread(err_fd, 500, 0)
+            stderr = raw.decode(errors="replace")[:500]
+            log_error(f"Command failed (exit {result.returncode}): {stderr}")
+            return None
+    finally:
+        if err_fd is not None:
+            os.close(err_fd)
     log_info(f"Completed in {elapsed:.2f}s")
     return elapsed
 
 
-def parse_probe_output(stdout_text: str) -> dict:
-    """Parse probe stdout (one overshoot_us per line) into latency stats."""
-    values = []
-    for line in stdout_text.splitlines():
-        line = line.strip()
-        if line and line.lstrip("-").isdigit():
-            values.append(float(line))
+# ONE SIGNED / UNSIGNED INTEGER PER LINE, AS THE PROBE AND THE INLINE
+# WORKER SCRIPTS PRINT THEM; OTHER LINES ARE IGNORED
+_INT_LINE = re.compile(rb"^[ \t]*(-?\d+)[ \t\r]*$", re.M)
+_UINT_LINE = re.compile(rb"^[ \t]*(\d+)[ \t\r]*$", re.M)
+
+
+def _line_ints(raw: bytes, signed: bool = True) -> list[int]:
+    """Integers from a worker's raw stdout, one findall over the bytes.
+
+    Replaces decode + splitlines + a strip()/isdigit() walk per line.
+    """
+    pattern = _INT_LINE if signed else _UINT_LINE
+    return list(map(int, pattern.findall(raw)))
+
+
+def parse_probe_output(raw: bytes) -> dict:
+    """Parse raw probe stdout (one overshoot_us per line) into latency stats."""
+    values = _line_ints(raw)
     if not values:
         return {"samples": 0, "median_us": 0, "p99_us": 0, "worst_us": 0}
     return {
@@ -548,7 +836,7 @@ def measure_latency(binary: Path, n_cpus: int, iterations: int = 1,
         warmup.wait()
 
     # Measurement iterations (pool all samples)
-    all_values: list[float] = []
+    all_values: list[int] = []
     for i in range(iterations):
         log_info(f"Latency iteration {i + 1}/{iterations}: {duration_secs}s")
         probe = subprocess.Popen(
@@ -563,10 +851,7 @@ def measure_latency(binary: Path, n_cpus: int, iterations: int = 1,
             probe.kill()
             stdout, _ = probe.communicate()
 
-        for line in stdout.decode(errors="replace").splitlines():
-            line = line.strip()
-            if line and line.lstrip("-").isdigit():
-                all_values.append(float(line))
+        all_values.extend(_line_ints(stdout))
 
     # Stop stress workers
     for w in workers:
@@ -675,7 +960,7 @@ def measure_burst(binary: Path, n_cpus: int, burst_size: int,
     except subprocess.TimeoutExpired:
         baseline_probe.kill()
         baseline_out, _ = baseline_probe.communicate()
-    baseline = parse_probe_output(baseline_out.decode(errors="replace"))
+    baseline = parse_probe_output(baseline_out)
     log_info(f"Baseline: {baseline['samples']} samples, "
              f"median={baseline['median_us']}us, "
              f"p99={baseline['p99_us']}us")
@@ -713,7 +998,7 @@ def measure_burst(binary: Path, n_cpus: int, burst_size: int,
     except subprocess.TimeoutExpired:
         burst_probe.kill()
         burst_out, _ = burst_probe.communicate()
-    burst_stats = parse_probe_output(burst_out.decode(errors="replace"))
+    burst_stats = parse_probe_output(burst_out)
     log_info(f"Burst: {burst_stats['samples']} samples, "
              f"median={burst_stats['median_us']}us, "
              f"p99={burst_stats['p99_us']}us, "
@@ -736,7 +1021,7 @@ def measure_burst(binary: Path, n_cpus: int, burst_size: int,
     except subprocess.TimeoutExpired:
         recovery_probe.kill()
         recovery_out, _ = recovery_probe.communicate()
-    recovery_stats = parse_probe_output(recovery_out.decode(errors="replace"))
+    recovery_stats = parse_probe_output(recovery_out)
     log_info(f"Recovery: {recovery_stats['samples']} samples, "
              f"p99={recovery_stats['p99_us']}us")
 
@@ -866,7 +1151,7 @@ def measure_longrun(binary: Path, n_cpus: int,
     except subprocess.TimeoutExpired:
         probe.kill()
         probe_out, _ = probe.communicate()
-    latency = parse_probe_output(probe_out.decode(errors="replace"))
+    latency = parse_probe_output(probe_out)
 
     total_work = sum(work_counts)
     min_work = min(work_counts) if work_counts else 0
@@ -1004,7 +1289,7 @@ def measure_mixed(binary: Path, n_cpus: int,
     except subprocess.TimeoutExpired:
         probe.kill()
         probe_out, _ = probe.communicate()
-    latency = parse_probe_output(probe_out.decode(errors="replace"))
+    latency = parse_probe_output(probe_out)
 
     total_work = sum(work_counts)
     min_work = min(work_counts) if work_counts else 0
@@ -1126,10 +1411,7 @@ def measure_deadline(binary: Path, n_cpus: int,
     for p in deadline_workers:
         try:
             stdout, _ = p.communicate(timeout=duration_secs + 10)
-            for line in stdout.decode(errors="replace").splitlines():
-                line = line.strip()
-                if line and line.lstrip("-").isdigit():
-                    all_jitter.append(int(line))
+            all_jitter.extend(_line_ints(stdout))
         except subprocess.TimeoutExpired:
             p.kill()
             p.wait()
@@ -1253,10 +1535,7 @@ def measure_ipc(binary: Path, n_cpus: int,
     for p in pairs:
         try:
             stdout, _ = p.communicate(timeout=120)
-            for line in stdout.decode(errors="replace").splitlines():
-                line = line.strip()
-                if line and line.isdigit():
-                    all_rtt.append(int(line))
+            all_rtt.extend(_line_ints(stdout, signed=False))
         except subprocess.TimeoutExpired:
             p.kill()
             p.wait()
@@ -1344,7 +1623,7 @@ def measure_launch(binary: Path, n_cpus: int,
             w.kill()
             w.wait()
 
-    m, std = mean_stdev([float(x) for x in latencies_us])
+    m, std = mean_stdev(latencies_us)
     result = {
         "survived": True,
         "launches": launch_count,
@@ -1363,150 +1642,187 @@ def measure_launch(binary: Path, n_cpus: int,
 
 # TELEMETRY PARSING
 
-def parse_tick_lines(stdout_text: str) -> list[dict]:
-    """Parse d/s: tick lines from scheduler stdout.
+# (BOUND search, FIELD NAMES): ONE COMPILED PATTERN PER FIELD GROUP, BUILT
+# ONCE AT IMPORT INSTEAD OF A re.search CACHE LOOKUP PER FIELD PER LINE
+_TICK_COMMON = tuple((re.compile(pat).search, names) for pat, names in (
+    (r"d/s:\s*(\d+)", ("dispatches",)),
+    (r"idle:\s*(\d+)%", ("idle_pct",)),
+    (r"shared:\s*(\d+)", ("shared",)),
+    (r"preempt:\s*(\d+)", ("preempt",)),
+    (r"keep:\s*(\d+)", ("keep",)),
+    (r"kick:\s*H=(\d+)\s*S=(\d+)", ("kick_hard", "kick_soft")),
+    (r"enq:\s*W=(\d+)\s*R=(\d+)", ("enq_wake", "enq_requeue")),
+    (r"wake:\s*(\d+)us", ("wake_avg_us",)),
+    (r"lat_idle:\s*(\d+)us", ("lat_idle_us",)),
+    (r"lat_kick:\s*(\d+)us", ("lat_kick_us",)),
+    (r"l2:\s*B=(\d+)%\s*I=(\d+)%\s*L=(\d+)%",
+     ("l2_pct_batch", "l2_pct_interactive", "l2_pct_latcrit")),
+))
+_TICK_BPF = tuple((re.compile(pat).search, names) for pat, names in (
+    (r"procdb:\s*(\d+)\s", ("procdb_hits",)),
+))
+_TICK_ADAPTIVE = tuple((re.compile(pat).search, names) for pat, names in (
+    (r"p99:\s*(\d+)us", ("p99_us",)),
+    (r"p99:.*?\[B:(\d+)\s*I:(\d+)\s*L:(\d+)\]",
+     ("tier_p99_batch", "tier_p99_interactive", "tier_p99_latcrit")),
+    (r"procdb:\s*(\d+)/(\d+)", ("procdb_total", "procdb_confident")),
+    (r"sleep:\s*io=(\d+)%", ("io_pct",)),
+    (r"slice:\s*(\d+)us", ("slice_us",)),
+    (r"batch:\s*(\d+)us", ("batch_us",)),
+))
+# REGIME + FLAGS: [BPF], [BPF BURST], [BPF LONGRUN],
+# [BPF BURST LONGRUN], [MIXED], [MIXED BURST], [HEAVY LONGRUN], etc.
+_TICK_REGIME = re.compile(
+    r'\[(BPF|Light|Mixed|Heavy|LIGHT|MIXED|HEAVY)((?:\s+(?:BURST|LONGRUN))*)\]')
+
+# WHOLE-LINE PATTERNS FOR THE TWO TICK FORMATS THE SCHEDULER PRINTS
+# (src/main.rs, src/adaptive.rs): ONE ANCHORED MATCH TOKENIZES A WELL-FORMED
+# LINE. ANYTHING ELSE FALLS BACK TO THE PER-FIELD TABLES ABOVE
+_TICK_HEAD = (
+    r"d/s:\s*(?P<dispatches>\d+)\s+idle:\s*(?P<idle_pct>\d+)%"
+    r"\s+shared:\s*(?P<shared>\d+)\s+preempt:\s*(?P<preempt>\d+)"
+    r"\s+keep:\s*(?P<keep>\d+)"
+    r"\s+kick:\s*H=(?P<kick_hard>\d+)\s*S=(?P<kick_soft>\d+)"
+    r"\s+enq:\s*W=(?P<enq_wake>\d+)\s*R=(?P<enq_requeue>\d+)"
+    r"\s+wake:\s*(?P<wake_avg_us>\d+)us")
+_TICK_LAT = (
+    r"\s+lat_idle:\s*(?P<lat_idle_us>\d+)us\s+lat_kick:\s*(?P<lat_kick_us>\d+)us")
+_TICK_TAIL = (
+    r"\s+l2:\s*B=(?P<l2_pct_batch>\d+)%\s*I=(?P<l2_pct_interactive>\d+)%"
+    r"\s*L=(?P<l2_pct_latcrit>\d+)%"
+    r"\s+\[(?P<regime>{regime})(?P<flags>(?:\s+(?:BURST|LONGRUN))*)\]\s*$")
+_TICK_BPF_LINE = re.compile(
+    _TICK_HEAD + _TICK_LAT
+    + r"\s+procdb:\s*(?P<procdb_hits>\d+)\s+reenq:\s*\S+\s+sjrn:\s*\S+"
+    + _TICK_TAIL.format(regime="BPF"))
+_TICK_ADAPTIVE_LINE = re.compile(
+    _TICK_HEAD
+    + r"\s+p99:\s*(?P<p99_us>\d+)us"
+    r"\s+\[B:(?P<tier_p99_batch>\d+)\s*I:(?P<tier_p99_interactive>\d+)"
+    r"\s*L:(?P<tier_p99_latcrit>\d+)\]"
+    + _TICK_LAT
+    + r"\s+procdb:\s*(?P<procdb_total>\d+)/(?P<procdb_confident>\d+)"
+    r"\s+sleep:\s*io=(?P<io_pct>\d+)%\s+slice:\s*(?P<slice_us>\d+)us"
+    r"\s+batch:\s*(?P<batch_us>\d+)us"
+    r"\s+reenq:\s*\S+\s+sjrn:\s*\S+\s+rescue:\s*\S+"
+    + _TICK_TAIL.format(regime="Light|Mixed|Heavy|LIGHT|MIXED|HEAVY"))
+
+
+def _scan_fields(line: str, fields, tick: dict) -> None:
+    for search, names in fields:
+        m = search(line)
+        if m:
+            for name, value in zip(names, m.groups()):
+                tick[name] = int(value)
+
+
+def _parse_tick(line: str) -> dict:
+    """Parse one d/s: tick line ({} if nothing recognisable)."""
+    m = _TICK_BPF_LINE.match(line) or _TICK_ADAPTIVE_LINE.match(line)
+    if m:
+        fields = m.groupdict()
+        regime = fields.pop("regime")
+        flags = fields.pop("flags").upper()
+        tick = {k: int(v) for k, v in fields.items()}
+        tick["regime"] = regime
+        tick["burst_active"] = "BURST" in flags
+        tick["longrun_active"] = "LONGRUN" in flags
+        return tick
+
+    tick = {}
+    _scan_fields(line, _TICK_COMMON, tick)
+
+    regime_match = _TICK_REGIME.search(line)
+    if regime_match:
+        tick["regime"] = regime_match.group(1)
+        flags = regime_match.group(2).upper()
+        tick["burst_active"] = "BURST" in flags
+        tick["longrun_active"] = "LONGRUN" in flags
+        _scan_fields(line, _TICK_BPF if tick["regime"] == "BPF"
+                     else _TICK_ADAPTIVE, tick)
+    return tick
+
+
+_KNOB_BOOLS = {"true": True, "false": False}
+# PREFIX -> KEY FOR THE ticks=L:5/M:12/H:3 AND l2_hit=B:75%/I:60%/L:80% KNOBS
+_TICK_LABEL_MAP = {"L": "ticks_light", "M": "ticks_mixed", "H": "ticks_heavy"}
+_L2_LABEL_MAP = {"B": "l2_hit_batch", "I": "l2_hit_interactive",
+                 "L": "l2_hit_latcrit"}
+
+
+def _parse_knobs(line: str) -> dict:
+    """Parse the key=value tail of a [KNOBS] line."""
+    knobs = {}
+    # WHITESPACE-SEPARATED key=value TOKENS: split() + partition(), NO REGEX
+    for tok in line.partition("[KNOBS]")[2].split():
+        k, _, v = tok.partition("=")
+        if not (k and v and k.isidentifier()):
+            continue
+        # NUMBERS ARE PRE-CHECKED SO STRING VALUES (regime, ticks, l2_hit)
+        # NEVER GO THROUGH A RAISED-AND-CAUGHT ValueError
+        if v in _KNOB_BOOLS:
+            knobs[k] = _KNOB_BOOLS[v]
+        elif v.removeprefix("-").isdecimal():
+            knobs[k] = int(v)
+        else:
+            knobs[k] = v
+
+    # Expand ticks=L:5/M:12/H:3
+    if "ticks" in knobs and isinstance(knobs["ticks"], str):
+        ticks_str = knobs.pop("ticks")
+        for part in ticks_str.split("/"):
+            if ":" in part:
+                prefix, val = part.split(":", 1)
+                label = _TICK_LABEL_MAP.get(prefix)
+                if label:
+                    try:
+                        knobs[label] = int(val)
+                    except ValueError:
+                        pass
+
+    # Expand l2_hit=B:75%/I:60%/L:80%
+    if "l2_hit" in knobs and isinstance(knobs["l2_hit"], str):
+        l2_str = knobs.pop("l2_hit")
+        for part in l2_str.split("/"):
+            if ":" in part:
+                prefix, val = part.split(":", 1)
+                label = _L2_LABEL_MAP.get(prefix)
+                if label:
+                    try:
+                        knobs[label] = int(val.rstrip("%"))
+                    except ValueError:
+                        pass
+
+    return knobs
+
+
+def parse_telemetry(stdout_text: str) -> tuple[list[dict], dict]:
+    """Parse tick lines and the first [KNOBS] line in one pass over stdout.
 
     Handles both BPF-only format (ends with [BPF]) and adaptive format
     (ends with [Light/Mixed/Heavy]).
     """
     ticks = []
+    knobs = None
     for line in stdout_text.splitlines():
-        if not line.startswith("d/s:"):
-            continue
+        if line.startswith("d/s:"):
+            tick = _parse_tick(line)
+            if tick:
+                ticks.append(tick)
+        elif knobs is None and "[KNOBS]" in line:
+            knobs = _parse_knobs(line)
+    return ticks, knobs or {}
 
-        tick = {}
 
-        # Common fields
-        m = re.search(r"d/s:\s*(\d+)", line)
-        if m:
-            tick["dispatches"] = int(m.group(1))
-        m = re.search(r"idle:\s*(\d+)%", line)
-        if m:
-            tick["idle_pct"] = int(m.group(1))
-        m = re.search(r"shared:\s*(\d+)", line)
-        if m:
-            tick["shared"] = int(m.group(1))
-        m = re.search(r"preempt:\s*(\d+)", line)
-        if m:
-            tick["preempt"] = int(m.group(1))
-        m = re.search(r"keep:\s*(\d+)", line)
-        if m:
-            tick["keep"] = int(m.group(1))
-        m = re.search(r"kick:\s*H=(\d+)\s*S=(\d+)", line)
-        if m:
-            tick["kick_hard"] = int(m.group(1))
-            tick["kick_soft"] = int(m.group(2))
-        m = re.search(r"enq:\s*W=(\d+)\s*R=(\d+)", line)
-        if m:
-            tick["enq_wake"] = int(m.group(1))
-            tick["enq_requeue"] = int(m.group(2))
-        m = re.search(r"wake:\s*(\d+)us", line)
-        if m:
-            tick["wake_avg_us"] = int(m.group(1))
-        m = re.search(r"lat_idle:\s*(\d+)us", line)
-        if m:
-            tick["lat_idle_us"] = int(m.group(1))
-        m = re.search(r"lat_kick:\s*(\d+)us", line)
-        if m:
-            tick["lat_kick_us"] = int(m.group(1))
-        m = re.search(r"l2:\s*B=(\d+)%\s*I=(\d+)%\s*L=(\d+)%", line)
-        if m:
-            tick["l2_pct_batch"] = int(m.group(1))
-            tick["l2_pct_interactive"] = int(m.group(2))
-            tick["l2_pct_latcrit"] = int(m.group(3))
-
-        # REGIME + FLAGS: [BPF], [BPF BURST], [BPF LONGRUN],
-        # [BPF BURST LONGRUN], [MIXED], [MIXED BURST], [HEAVY LONGRUN], etc.
-        regime_match = re.search(
-            r'\[(BPF|Light|Mixed|Heavy|LIGHT|MIXED|HEAVY)((?:\s+(?:BURST|LONGRUN))*)\]', line)
-        if regime_match:
-            tick["regime"] = regime_match.group(1)
-            flags = regime_match.group(2).upper()
-            tick["burst_active"] = "BURST" in flags
-            tick["longrun_active"] = "LONGRUN" in flags
-
-            if tick["regime"] == "BPF":
-                m = re.search(r"procdb:\s*(\d+)\s", line)
-                if m:
-                    tick["procdb_hits"] = int(m.group(1))
-            else:
-                m = re.search(r"p99:\s*(\d+)us", line)
-                if m:
-                    tick["p99_us"] = int(m.group(1))
-                m = re.search(r"p99:.*?\[B:(\d+)\s*I:(\d+)\s*L:(\d+)\]", line)
-                if m:
-                    tick["tier_p99_batch"] = int(m.group(1))
-                    tick["tier_p99_interactive"] = int(m.group(2))
-                    tick["tier_p99_latcrit"] = int(m.group(3))
-                m = re.search(r"procdb:\s*(\d+)/(\d+)", line)
-                if m:
-                    tick["procdb_total"] = int(m.group(1))
-                    tick["procdb_confident"] = int(m.group(2))
-                m = re.search(r"sleep:\s*io=(\d+)%", line)
-                if m:
-                    tick["io_pct"] = int(m.group(1))
-                m = re.search(r"slice:\s*(\d+)us", line)
-                if m:
-                    tick["slice_us"] = int(m.group(1))
-                m = re.search(r"batch:\s*(\d+)us", line)
-                if m:
-                    tick["batch_us"] = int(m.group(1))
-        if tick:
-            ticks.append(tick)
-
-    return ticks
-
-
-def parse_knobs_line(stdout_text: str) -> dict:
-    """Parse [KNOBS] summary line from scheduler stdout."""
+def parse_tick_lines(stdout_text: str) -> list[dict]:
+    """Parse d/s: tick lines from scheduler stdout."""
+    ticks = []
     for line in stdout_text.splitlines():
-        if "[KNOBS]" not in line:
-            continue
-
-        knobs = {}
-        for m in re.finditer(r"(\w+)=(\S+)", line.split("[KNOBS]")[1]):
-            k, v = m.group(1), m.group(2)
-            if v == "true":
-                knobs[k] = True
-            elif v == "false":
-                knobs[k] = False
-            else:
-                try:
-                    knobs[k] = int(v)
-                except ValueError:
-                    knobs[k] = v
-
-        # Expand ticks=L:5/M:12/H:3
-        if "ticks" in knobs and isinstance(knobs["ticks"], str):
-            ticks_str = knobs.pop("ticks")
-            for part in ticks_str.split("/"):
-                if ":" in part:
-                    prefix, val = part.split(":", 1)
-                    label = {"L": "ticks_light", "M": "ticks_mixed",
-                             "H": "ticks_heavy"}.get(prefix)
-                    if label:
-                        try:
-                            knobs[label] = int(val)
-                        except ValueError:
-                            pass
-
-        # Expand l2_hit=B:75%/I:60%/L:80%
-        if "l2_hit" in knobs and isinstance(knobs["l2_hit"], str):
-            l2_str = knobs.pop("l2_hit")
-            for part in l2_str.split("/"):
-                if ":" in part:
-                    prefix, val = part.split(":", 1)
-                    label = {"B": "l2_hit_batch", "I": "l2_hit_interactive",
-                             "L": "l2_hit_latcrit"}.get(prefix)
-                    if label:
-                        try:
-                            knobs[label] = int(val.rstrip("%"))
-                        except ValueError:
-                            pass
-
-        return knobs
-
-    return {}
+        if line.startswith("d/s:"):
+            tick = _parse_tick(line)
+            if tick:
+                ticks.append(tick)
+    return ticks
 
 
 def aggregate_ticks(ticks: list[dict]) -> dict:
@@ -1514,35 +1830,50 @@ def aggregate_ticks(ticks: list[dict]) -> dict:
     if not ticks:
         return {}
 
-    agg = {}
-    numeric_keys = set()
+    # ONE PASS TRANSPOSES THE TICKS INTO PER-FIELD COLUMNS, INSTEAD OF A
+    # KEY-DISCOVERY PASS PLUS ONE FULL PASS PER FIELD
+    columns: dict[str, list[float]] = {}
     for t in ticks:
         for k, v in t.items():
             if isinstance(v, (int, float)) and k != "regime":
-                numeric_keys.add(k)
+                col = columns.get(k)
+                if col is None:
+                    columns[k] = col = []
+                col.append(float(v))
 
-    for key in sorted(numeric_keys):
-        values = [float(t[key]) for t in ticks if key in t]
-        if not values:
-            continue
-        agg[key] = {
+    agg = {
+        key: {
             "mean": round(sum(values) / len(values), 1),
             "p99": round(percentile(values, 99), 1),
             "last": values[-1],
         }
+        for key, values in sorted(columns.items())
+    }
 
     # Regime distribution
-    regimes = [t.get("regime", "") for t in ticks if t.get("regime")]
-    if regimes:
-        agg["regime_counts"] = {}
-        for r in regimes:
-            agg["regime_counts"][r] = agg["regime_counts"].get(r, 0) + 1
+    regime_counts = {}
+    for t in ticks:
+        r = t.get("regime")
+        if r:
+            regime_counts[r] = regime_counts.get(r, 0) + 1
+    if regime_counts:
+        agg["regime_counts"] = regime_counts
 
     return agg
 
 
 # PROMETHEUS OUTPUT
 
+def _write_lines(path: Path, lines: list[str]) -> None:
+    """Write lines to path, each newline-terminated.
+
+    Streams through one 64K buffer instead of joining the whole file into a
+    string and copying it again to append the final newline.
+    """
+    with open(path, "w", buffering=1 << 16) as f:
+        f.writelines(f"{line}\n" for line in lines)
+
+
 def write_prometheus(data: dict, stamp: str) -> Path:
     """Write Prometheus exposition format (.prom) to ~/.cache/pandemonium/."""
     lines = []
@@ -1572,8 +1903,10 @@ def write_prometheus(data: dict, stamp: str) -> Path:
     gauge("pandemonium_bench_max_cpus", "Maximum CPUs available",
           data.get("max_cpus", 0))
 
+    # RESULTS ARE INSERTED WALKING core_counts, WHICH IS SORTED: INSERTION
+    # ORDER IS ALREADY ASCENDING CORE COUNT
     results = data.get("results", {})
-    for cores_str, schedulers in sorted(results.items(), key=lambda x: int(x[0])):
+    for cores_str, schedulers in results.items():
         cores = cores_str
 
         for sched_name, sched_data in schedulers.items():
@@ -1847,7 +2180,7 @@ def write_prometheus(data: dict, stamp: str) -> Path:
     ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
     version = data.get("version", "unknown")
     path = ARCHIVE_DIR / f"{version}-{stamp}.prom"
-    path.write_text("\n".join(lines) + "\n")
+    _write_lines(path, lines)
     return path
 
 
@@ -2039,8 +2372,9 @@ def format_report(data: dict) -> str:
     lines.append(f"MAX CPUS:    {data.get('max_cpus', '?')}")
     lines.append("")
 
+    # INSERTION ORDER IS ASCENDING CORE COUNT (core_counts IS SORTED)
     results = data.get("results", {})
-    sorted_cores = sorted(results.keys(), key=int)
+    sorted_cores = list(results)
 
     for cores_str in sorted_cores:
         schedulers = results[cores_str]
@@ -2227,25 +2561,25 @@ def format_report(data: dict) -> str:
         lines.append("")
 
     # Summary matrix: throughput delta vs EEVDF
-    all_schedulers = []
-    for cores_str in sorted_cores:
-        for name in results[cores_str]:
-            if name not in all_schedulers:
-                all_schedulers.append(name)
+    # FIRST-SEEN ORDER ACROSS CORE COUNTS, WITHOUT A LIST SCAN PER NAME
+    all_schedulers = list(dict.fromkeys(
+        name for cores_str in sorted_cores for name in results[cores_str]))
+    # EVERY MATRIX SHARES ONE HEADER ROW; BUILD IT ONCE
+    matrix_header = f"{'SCHEDULER':<28}" + "".join(
+        f" {c + 'C':>8}" for c in sorted_cores)
+    # ONE ROW OF PER-CORE-COUNT RESULT DICTS PER SCHEDULER, RESOLVED ONCE;
+    # EVERY MATRIX BELOW WALKS THESE ROWS INSTEAD OF RE-CHAINING .get()s
+    grid = {sched: [results.get(c, {}).get(sched, {}) for c in sorted_cores]
+            for sched in all_schedulers}
 
     if len(all_schedulers) > 1 and len(sorted_cores) > 1:
         lines.append("THROUGHPUT VS EEVDF (NEGATIVE = FASTER)")
-        header = f"{'SCHEDULER':<28}"
-        for c in sorted_cores:
-            header += f" {c + 'C':>8}"
-        lines.append(header)
+        lines.append(matrix_header)
 
-        for sched in all_schedulers:
-            if sched == all_schedulers[0]:
-                continue
+        for sched in all_schedulers[1:]:
             row = f"{sched:<28}"
-            for c in sorted_cores:
-                tp = results.get(c, {}).get(sched, {}).get("throughput", {})
+            for cell in grid[sched]:
+                tp = cell.get("throughput", {})
                 delta = tp.get("vs_eevdf_pct")
                 if delta is not None:
                     row += f" {delta:>+7.1f}%"
@@ -2256,15 +2590,12 @@ def format_report(data: dict) -> str:
         lines.append("")
 
         lines.append("LATENCY P99 (us)")
-        header = f"{'SCHEDULER':<28}"
-        for c in sorted_cores:
-            header += f" {c + 'C':>8}"
-        lines.append(header)
+        lines.append(matrix_header)
 
         for sched in all_schedulers:
             row = f"{sched:<28}"
-            for c in sorted_cores:
-                lat = results.get(c, {}).get(sched, {}).get("latency", {})
+            for cell in grid[sched]:
+                lat = cell.get("latency", {})
                 p99 = lat.get("p99_us")
                 if p99 is not None and lat.get("samples", 0) > 0:
                     row += f" {p99:>8}"
@@ -2276,20 +2607,17 @@ def format_report(data: dict) -> str:
 
         # Burst summary matrix
         has_any_burst = any(
-            results.get(c, {}).get(s, {}).get("burst", {})
+            cell.get("burst", {})
             .get("burst", {}).get("samples", 0) > 0
-            for c in sorted_cores for s in all_schedulers)
+            for cells in grid.values() for cell in cells)
         if has_any_burst:
             lines.append("BURST P99 (us)")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    br = results.get(c, {}).get(sched, {}).get("burst", {})
+                for cell in grid[sched]:
+                    br = cell.get("burst", {})
                     burst = br.get("burst", {})
                     p99 = burst.get("p99_us")
                     if p99 is not None and burst.get("samples", 0) > 0:
@@ -2304,20 +2632,17 @@ def format_report(data: dict) -> str:
 
         # Long-run summary matrix
         has_any_longrun = any(
-            results.get(c, {}).get(s, {}).get("longrun", {})
+            cell.get("longrun", {})
             .get("latency", {}).get("samples", 0) > 0
-            for c in sorted_cores for s in all_schedulers)
+            for cells in grid.values() for cell in cells)
         if has_any_longrun:
             lines.append("LONG-RUN LATENCY P99 (us)")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    lr = results.get(c, {}).get(sched, {}).get("longrun", {})
+                for cell in grid[sched]:
+                    lr = cell.get("longrun", {})
                     lat = lr.get("latency", {})
                     p99 = lat.get("p99_us")
                     if p99 is not None and lat.get("samples", 0) > 0:
@@ -2331,15 +2656,12 @@ def format_report(data: dict) -> str:
             lines.append("")
 
             lines.append("LONG-RUN WORK (MIN PER-PROCESS)")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    lr = results.get(c, {}).get(sched, {}).get("longrun", {})
+                for cell in grid[sched]:
+                    lr = cell.get("longrun", {})
                     work_min = lr.get("work_min")
                     if work_min is not None and work_min > 0:
                         row += f" {work_min:>8}"
@@ -2350,15 +2672,12 @@ def format_report(data: dict) -> str:
             lines.append("")
 
             lines.append("LONG-RUN WORK (MAX PER-PROCESS)")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    lr = results.get(c, {}).get(sched, {}).get("longrun", {})
+                for cell in grid[sched]:
+                    lr = cell.get("longrun", {})
                     work_max = lr.get("work_max")
                     if work_max is not None and work_max > 0:
                         row += f" {work_max:>8}"
@@ -2370,20 +2689,17 @@ def format_report(data: dict) -> str:
 
         # Mixed summary matrix
         has_any_mixed = any(
-            results.get(c, {}).get(s, {}).get("mixed", {})
+            cell.get("mixed", {})
             .get("latency", {}).get("samples", 0) > 0
-            for c in sorted_cores for s in all_schedulers)
+            for cells in grid.values() for cell in cells)
         if has_any_mixed:
             lines.append("MIXED LATENCY P99 (us)")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    mx = results.get(c, {}).get(sched, {}).get("mixed", {})
+                for cell in grid[sched]:
+                    mx = cell.get("mixed", {})
                     lat = mx.get("latency", {})
                     p99 = lat.get("p99_us")
                     if p99 is not None and lat.get("samples", 0) > 0:
@@ -2397,15 +2713,12 @@ def format_report(data: dict) -> str:
             lines.append("")
 
             lines.append("MIXED WORK MIN (PER-PROCESS)")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    mx = results.get(c, {}).get(sched, {}).get("mixed", {})
+                for cell in grid[sched]:
+                    mx = cell.get("mixed", {})
                     work_min = mx.get("work_min")
                     if work_min is not None and work_min > 0:
                         row += f" {work_min:>8}"
@@ -2416,15 +2729,12 @@ def format_report(data: dict) -> str:
             lines.append("")
 
             lines.append("MIXED WORK MAX (PER-PROCESS)")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    mx = results.get(c, {}).get(sched, {}).get("mixed", {})
+                for cell in grid[sched]:
+                    mx = cell.get("mixed", {})
                     work_max = mx.get("work_max")
                     if work_max is not None and work_max > 0:
                         row += f" {work_max:>8}"
@@ -2436,20 +2746,17 @@ def format_report(data: dict) -> str:
 
         # Deadline jitter summary matrix
         has_any_deadline = any(
-            results.get(c, {}).get(s, {}).get("deadline", {})
+            cell.get("deadline", {})
             .get("total_frames", 0) > 0
-            for c in sorted_cores for s in all_schedulers)
+            for cells in grid.values() for cell in cells)
         if has_any_deadline:
             lines.append("DEADLINE JITTER P99 (us)")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    dl = results.get(c, {}).get(sched, {}).get("deadline", {})
+                for cell in grid[sched]:
+                    dl = cell.get("deadline", {})
                     jp99 = dl.get("jitter_p99_us")
                     if jp99 is not None and dl.get("total_frames", 0) > 0:
                         survived = dl.get("survived", True)
@@ -2462,15 +2769,12 @@ def format_report(data: dict) -> str:
             lines.append("")
 
             lines.append("DEADLINE MISS RATIO")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    dl = results.get(c, {}).get(sched, {}).get("deadline", {})
+                for cell in grid[sched]:
+                    dl = cell.get("deadline", {})
                     ratio = dl.get("miss_ratio")
                     if ratio is not None and dl.get("total_frames", 0) > 0:
                         row += f" {ratio:>7.1%}"
@@ -2482,20 +2786,17 @@ def format_report(data: dict) -> str:
 
         # IPC round-trip summary matrix
         has_any_ipc = any(
-            results.get(c, {}).get(s, {}).get("ipc", {})
+            cell.get("ipc", {})
             .get("total_ops", 0) > 0
-            for c in sorted_cores for s in all_schedulers)
+            for cells in grid.values() for cell in cells)
         if has_any_ipc:
             lines.append("IPC ROUND-TRIP P99 (us)")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    ipc = results.get(c, {}).get(sched, {}).get("ipc", {})
+                for cell in grid[sched]:
+                    ipc = cell.get("ipc", {})
                     rp99 = ipc.get("rtt_p99_us")
                     if rp99 is not None and ipc.get("total_ops", 0) > 0:
                         survived = ipc.get("survived", True)
@@ -2509,20 +2810,17 @@ def format_report(data: dict) -> str:
 
         # App launch summary matrix
         has_any_launch = any(
-            results.get(c, {}).get(s, {}).get("launch", {})
+            cell.get("launch", {})
             .get("launches", 0) > 0
-            for c in sorted_cores for s in all_schedulers)
+            for cells in grid.values() for cell in cells)
         if has_any_launch:
             lines.append("APP LAUNCH P99 (us)")
-            header = f"{'SCHEDULER':<28}"
-            for c in sorted_cores:
-                header += f" {c + 'C':>8}"
-            lines.append(header)
+            lines.append(matrix_header)
 
             for sched in all_schedulers:
                 row = f"{sched:<28}"
-                for c in sorted_cores:
-                    lnch = results.get(c, {}).get(sched, {}).get("launch", {})
+                for cell in grid[sched]:
+                    lnch = cell.get("launch", {})
                     lp99 = lnch.get("launch_p99_us")
                     if lp99 is not None and lnch.get("launches", 0) > 0:
                         survived = lnch.get("survived", True)
@@ -2577,8 +2875,8 @@ def collect_burst_times(procs: list[subprocess.Popen],
         try:
             stdout, _ = p.communicate(timeout=timeout)
             for line in stdout.decode(errors="replace").splitlines():
-                line = line.strip()
-                if line:
+                # float() SKIPS SURROUNDING WHITESPACE ITSELF; NO strip() COPY
+                if line and not line.isspace():
                     try:
                         times.append(float(line))
                     except ValueError:
@@ -2643,7 +2941,7 @@ def measure_burst_starvation(binary: Path, n_cpus: int,
     except subprocess.TimeoutExpired:
         baseline_probe.kill()
         baseline_out, _ = baseline_probe.communicate()
-    baseline = parse_probe_output(baseline_out.decode(errors="replace"))
+    baseline = parse_probe_output(baseline_out)
     log_info(f"[burst-starvation] Baseline: median={baseline['median_us']}us "
              f"p99={baseline['p99_us']}us")
 
@@ -2677,7 +2975,7 @@ def measure_burst_starvation(binary: Path, n_cpus: int,
     except subprocess.TimeoutExpired:
         burst_probe.kill()
         burst_out, _ = burst_probe.communicate()
-    burst_lat = parse_probe_output(burst_out.decode(errors="replace"))
+    burst_lat = parse_probe_output(burst_out)
 
     # RECOVERY PROBE (5S)
     log_info("[burst-starvation] Recovery: 5s")
@@ -2692,7 +2990,7 @@ def measure_burst_starvation(binary: Path, n_cpus: int,
     except subprocess.TimeoutExpired:
         recovery_probe.kill()
         recovery_out, _ = recovery_probe.communicate()
-    recovery = parse_probe_output(recovery_out.decode(errors="replace"))
+    recovery = parse_probe_output(recovery_out)
 
     # STOP STRESS WORKERS
     for w in workers:
@@ -2795,7 +3093,7 @@ def measure_work_stealing(binary: Path, n_cpus: int) -> dict:
     except subprocess.TimeoutExpired:
         sym_probe.kill()
         sym_out, _ = sym_probe.communicate()
-    symmetric = parse_probe_output(sym_out.decode(errors="replace"))
+    symmetric = parse_probe_output(sym_out)
 
     for w in sym_workers:
         w.send_signal(signal.SIGINT)
@@ -2844,7 +3142,7 @@ def measure_work_stealing(binary: Path, n_cpus: int) -> dict:
     except subprocess.TimeoutExpired:
         asym_probe.kill()
         asym_out, _ = asym_probe.communicate()
-    asymmetric = parse_probe_output(asym_out.decode(errors="replace"))
+    asymmetric = parse_probe_output(asym_out)
 
     for w in asym_workers:
         w.send_signal(signal.SIGINT)
@@ -3092,7 +3390,7 @@ def cmd_bench_pcpu(args) -> int:
     log_info(f"PANDEMONIUMv{version} BENCH-PCPU RESULTS")
     log_info("")
 
-    for nr_cpus in sorted(all_results.keys()):
+    for nr_cpus in all_results:
         cr = all_results[nr_cpus]
         log_info(f"  {nr_cpus}C:")
 
@@ -3136,7 +3434,7 @@ def cmd_bench_pcpu(args) -> int:
     with open(prom_path, "w") as f:
         f.write(f'# PANDEMONIUM bench-pcpu v{version}\n')
         f.write(f'# {datetime.now().isoformat()}\n')
-        for nr_cpus in sorted(all_results.keys()):
+        for nr_cpus in all_results:
             cr = all_results[nr_cpus]
             for test_name in ["burst", "steal", "sojourn"]:
                 results = cr[test_name]
@@ -3165,33 +3463,33 @@ def cmd_bench_pcpu(args) -> int:
 
 # BENCH-SCALE COMMAND
 
-def entries_for_cores(
-    base_entries: list[tuple[str, list[str] | None]],
-    n: int,
-) -> list[tuple[str, list[str] | None]]:
+# (NAME, ARGV) PAIRS; ARGV None FOR EEVDF. TUPLES ALL THE WAY DOWN SO ONE
+# SWEEP SHARES THE EXTERNAL ARGVS AND entries_for_cores CAN BE CACHED
+SchedEntries = tuple[tuple[str, tuple[str, ...] | None], ...]
+
+
+@functools.lru_cache(maxsize=None)
+def entries_for_cores(base_entries: SchedEntries, n: int) -> SchedEntries:
     """Adjust scheduler commands for a specific core count.
 
     PANDEMONIUM variants get --nr-cpus N.
     External schedulers see the online CPUs via kernel.
     EEVDF is None (no scheduler process).
     """
-    adjusted = []
-    for name, cmd in base_entries:
-        if cmd is None:
-            adjusted.append((name, None))
-        elif "PANDEMONIUM" in name:
-            adjusted.append((name, cmd + ["--nr-cpus", str(n)]))
-        else:
-            adjusted.append((name, list(cmd)))
-    return adjusted
+    return tuple(
+        (name, cmd + ("--nr-cpus", str(n)))
+        if cmd is not None and "PANDEMONIUM" in name else (name, cmd)
+        for name, cmd in base_entries)
 
 
 def cmd_bench_scale(args) -> int:
     """Unified benchmark: throughput + latency at each core count."""
 
-    subprocess.run(["sudo", "true"])
+    # ONE sudo FOR THE WHOLE SWEEP: HOTPLUG AND DMESG GO THROUGH THE HELPER
+    if not start_priv_helper():
+        subprocess.run(["sudo", "true"])
 
-    dmesg = DmesgMonitor()
+    dmesg = DmesgMonitor(skip=args.skip_dmesg)
 
     # Trace capture (optional)
     trace = None
@@ -3237,19 +3535,21 @@ def cmd_bench_scale(args) -> int:
     print()
 
     # Build entry list: EEVDF + PANDEMONIUM (BPF) + PANDEMONIUM (ADAPTIVE) + externals
-    base_entries: list[tuple[str, list[str] | None]] = [
+    entries = [
         ("EEVDF", None),
-        ("PANDEMONIUM (BPF)", [str(BINARY), "--verbose", "--no-adaptive"]),
-        ("PANDEMONIUM (ADAPTIVE)", [str(BINARY), "--verbose"]),
+        ("PANDEMONIUM (BPF)", (str(BINARY), "--verbose", "--no-adaptive")),
+        ("PANDEMONIUM (ADAPTIVE)", (str(BINARY), "--verbose")),
     ]
 
     for name in args.schedulers:
         path = find_scheduler(name)
         if path:
             log_info(f"Found: {name} ({path})")
-            base_entries.append((name, [name]))
+            # RESOLVED ONCE: EVERY LATER START EXECS THE PATH, NO PATH WALK
+            entries.append((name, (path,)))
         else:
             log_warn(f"SKIPPING {name} (not installed)")
+    base_entries: SchedEntries = tuple(entries)
 
     # Workload
     workload_cmd = args.cmd or f"CARGO_TARGET_DIR={TARGET_DIR} cargo build --release"
@@ -3309,8 +3609,6 @@ def cmd_bench_scale(args) -> int:
         "results": {},
     }
 
-    eevdf_mean = {}  # {cores_str: mean_s} for vs_eevdf calculation
-
     with CpuGuard(max_cpus):
         restore_all_cpus(max_cpus)
         time.sleep(0.5)
@@ -3318,6 +3616,9 @@ def cmd_bench_scale(args) -> int:
         for n in core_counts:
             cores_str = str(n)
             data["results"][cores_str] = {}
+            # EEVDF THROUGHPUT MEAN AT THIS CORE COUNT (0 UNTIL MEASURED);
+            # THE ENTRY LIST STARTS WITH EEVDF, SO LATER SCHEDULERS SEE IT
+            eevdf_mean = 0.0
 
             log_info(f"[{n} CORES]")
 
@@ -3366,6 +3667,9 @@ def cmd_bench_scale(args) -> int:
                     sched_result["latency"] = latency
 
                     # Throughput measurement
+                    # ITERATIONS STAY SERIAL: CONCURRENT RUNS WOULD SHARE THE
+                    # HOTPLUG-RESTRICTED CPUS UNDER TEST AND CORRUPT EVERY
+                    # WALL-CLOCK SAMPLE (AND THEY SHARE ONE TARGET DIR)
                     times = []
                     for i in range(args.iterations):
                         log_info(f"Throughput iteration {i + 1}/{args.iterations}")
@@ -3381,11 +3685,9 @@ def cmd_bench_scale(args) -> int:
                               "mean_s": round(m, 2),
                               "stdev_s": round(std, 2)}
                         if sched_name == "EEVDF":
-                            eevdf_mean[cores_str] = m
-                        elif (cores_str in eevdf_mean
-                              and eevdf_mean[cores_str] > 0):
-                            delta = ((m - eevdf_mean[cores_str])
-                                     / eevdf_mean[cores_str]) * 100.0
+                            eevdf_mean = m
+                        elif eevdf_mean > 0:
+                            delta = ((m - eevdf_mean) / eevdf_mean) * 100.0
                             tp["vs_eevdf_pct"] = round(delta, 1)
                         sched_result["throughput"] = tp
 
@@ -3456,8 +3758,7 @@ def cmd_bench_scale(args) -> int:
                 # Stop scheduler, capture telemetry
                 stdout = stop_and_wait(guard)
                 if stdout and "PANDEMONIUM" in sched_name:
-                    ticks = parse_tick_lines(stdout)
-                    knobs = parse_knobs_line(stdout)
+                    ticks, knobs = parse_telemetry(stdout)
 
                     # BURST ACTIVATION VERIFICATION
                     if "burst" in sched_result:
@@ -3522,6 +3823,9 @@ def cmd_bench_scale(args) -> int:
                 for line in tail:
                     log_info(f"  {line.rstrip()}")
 
+    # CHOWN RUNS IN THE BACKGROUND WHILE THE SERVICE COMES BACK UP
+    chowns = start_fix_ownership()
+
     # Restart PANDEMONIUM service if it was running
     ret = subprocess.run(["systemctl", "is-enabled", "pandemonium"],
                          capture_output=True).returncode
@@ -3534,7 +3838,8 @@ def cmd_bench_scale(args) -> int:
         else:
             log_warn("Failed to restart PANDEMONIUM service")
 
-    fix_ownership()
+    for proc in chowns:
+        proc.wait()
 
     if not data["results"]:
         return 1
@@ -3543,6 +3848,23 @@ def cmd_bench_scale(args) -> int:
 
 # BENCH-SYS COMMAND
 
+def _read_appended(path: str, offset: int,
+                   final: bool = False) -> tuple[str, int]:
+    """Text appended to path since byte offset, and the offset to resume at.
+
+    Only complete lines are returned unless final is set; a partial last
+    line is left for the next call. Returns ("", offset) if unreadable.
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except (FileNotFoundError, PermissionError):
+        return "", offset
+    end = len(data) if final else data.rfind(b"\n") + 1
+    return data[:end].decode(errors="replace"), offset + end
+
+
 def cmd_bench_sys(args) -> int:
     """Live system telemetry capture. Run a scheduler, use your desktop,
     Ctrl+C when done. Writes Prometheus metrics from the session.
@@ -3651,6 +3973,9 @@ def cmd_bench_sys(args) -> int:
 
     # Live loop: append ticks to .prom as they arrive
     ticks_written = 0
+    # BYTE OFFSET PAST THE LAST COMPLETE LINE ALREADY PARSED; EACH PASS ONLY
+    # READS AND PARSES WHAT ARRIVED SINCE, NOT THE WHOLE LOG AGAIN
+    parsed_upto = 0
     try:
         while True:
             if guard is not None and guard.proc.poll() is not None:
@@ -3659,18 +3984,14 @@ def cmd_bench_sys(args) -> int:
             time.sleep(1)
 
             if is_pandemonium and guard is not None and guard.stdout_path:
-                try:
-                    stdout_text = Path(guard.stdout_path).read_text()
-                except (FileNotFoundError, PermissionError):
-                    continue
-                ticks = parse_tick_lines(stdout_text)
-                new_count = len(ticks) - ticks_written
-                if new_count > 0:
+                new_text, parsed_upto = _read_appended(
+                    guard.stdout_path, parsed_upto)
+                ticks = parse_tick_lines(new_text)
+                if ticks:
                     now_ms = int(time.time() * 1000)
                     prom_sys_append_ticks(
-                        prom_path, ticks[ticks_written:],
-                        label_str, now_ms)
-                    ticks_written = len(ticks)
+                        prom_path, ticks, label_str, now_ms)
+                    ticks_written += len(ticks)
     except KeyboardInterrupt:
         print()
         log_info("Stopping...")
@@ -3687,8 +4008,7 @@ def cmd_bench_sys(args) -> int:
             except subprocess.TimeoutExpired:
                 probe_proc.kill()
                 stdout_bytes, _ = probe_proc.communicate()
-            probe_latency = parse_probe_output(
-                stdout_bytes.decode(errors="replace"))
+            probe_latency = parse_probe_output(stdout_bytes)
             prom_sys_append_probe(prom_path, probe_latency, label_str)
             log_info(f"Probe: {probe_latency['samples']} samples, "
                      f"median={probe_latency['median_us']}us, "
@@ -3696,16 +4016,18 @@ def cmd_bench_sys(args) -> int:
                      f"worst={probe_latency['worst_us']}us")
 
         # Stop scheduler, flush remaining ticks + knobs
-        sched_stdout = stop_and_wait(guard)
-        if is_pandemonium and sched_stdout:
-            ticks = parse_tick_lines(sched_stdout)
-            if len(ticks) > ticks_written:
+        # THE LIVE LOOP ALREADY CONSUMED STDOUT UP TO parsed_upto; ONLY THE
+        # TAIL IS READ BELOW, NEVER THE WHOLE LOG
+        stop_and_wait(guard, drain=False)
+        if is_pandemonium and guard is not None and guard.stdout_path:
+            new_text, parsed_upto = _read_appended(
+                guard.stdout_path, parsed_upto, final=True)
+            ticks, knobs = parse_telemetry(new_text)
+            if ticks:
                 now_ms = int(time.time() * 1000)
                 prom_sys_append_ticks(
-                    prom_path, ticks[ticks_written:],
-                    label_str, now_ms)
-                ticks_written = len(ticks)
-            knobs = parse_knobs_line(sched_stdout)
+                    prom_path, ticks, label_str, now_ms)
+                ticks_written += len(ticks)
             prom_sys_append_knobs(prom_path, knobs, label_str)
 
         # Console summary
@@ -3719,6 +4041,7 @@ def cmd_bench_sys(args) -> int:
 
     except Exception:
         log_error("Cleanup failed:")
+        import traceback
         traceback.print_exc()
         if guard is not None:
             try:
@@ -4066,7 +4389,7 @@ def _trace_start_scheduler(nr_cpus=None):
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        preexec_fn=os.setpgrp,
+        process_group=0,
         text=True,
     )
     deadline = time.monotonic() + 10.0
@@ -4261,7 +4584,7 @@ def cmd_bench_trace(args) -> int:
         total_crashed = 0
         if results:
             log_info("SUMMARY")
-            for nr_cpus in sorted(results.keys()):
+            for nr_cpus in results:
                 s, c = results[nr_cpus]
                 total_survived += s
                 total_crashed += c
@@ -4718,7 +5041,7 @@ def _write_contention_prometheus(version, git, stamp, max_cpus, iterations,
     gauge("pandemonium_contention_iterations", "Iterations per core count", iterations)
     gauge("pandemonium_contention_max_cpus", "Maximum CPUs available", max_cpus)
 
-    for nr_cpus in sorted(results.keys()):
+    for nr_cpus in results:
         s, c = results[nr_cpus]
         cl = {"cores": str(nr_cpus)}
         gauge("pandemonium_contention_survived", "Iterations survived", s, cl)
@@ -4774,7 +5097,7 @@ def _write_contention_prometheus(version, git, stamp, max_cpus, iterations,
 
     ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
     path = ARCHIVE_DIR / f"contention-{version}-{stamp}.prom"
-    path.write_text("\n".join(lines) + "\n")
+    _write_lines(path, lines)
     return path
 
 
@@ -4872,7 +5195,7 @@ def cmd_bench_contention(args) -> int:
         if results:
             print()
             log_info("SUMMARY")
-            for nr_cpus in sorted(results.keys()):
+            for nr_cpus in results:
                 s, c = results[nr_cpus]
                 total_survived += s
                 total_crashed += c
@@ -4892,7 +5215,7 @@ def cmd_bench_contention(args) -> int:
         report_lines = [f"bench-contention v{ver} [{git['commit']}]",
                         f"cores: {core_counts}  iterations: {args.iterations}  host: {max_cpus}C",
                         ""]
-        for nr_cpus in sorted(results.keys()):
+        for nr_cpus in results:
             s, c = results[nr_cpus]
             status = "PASS" if c == 0 else "FAIL"
             report_lines.append(f"{nr_cpus:>3}C: {s}/{s+c} survived  {status}")
@@ -5085,7 +5408,7 @@ def _cs2_write_prometheus(version, git, stamp, target, elapsed,
 
     ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
     path = ARCHIVE_DIR / f"cs2-{version}-{stamp}.prom"
-    path.write_text("\n".join(lines) + "\n")
+    _write_lines(path, lines)
     return path
 
 
@@ -5306,7 +5629,7 @@ def cmd_bench_cs2(args) -> int:
             log_info(line)
 
         report_path = LOG_DIR / f"bench-cs2-{stamp}.log"
-        report_path.write_text("\n".join(report_lines) + "\n")
+        _write_lines(report_path, report_lines)
         log_info(f"Report: {report_path}")
         log_info(f"Raw trace: {trace_path}")
 
@@ -5348,6 +5671,7 @@ SCX_CI_FALSE_POSITIVES = [
     "retbleed",
     "mitigation",
 ]
+_SCX_CI_FALSE_POSITIVES_LC = tuple(fp.lower() for fp in SCX_CI_FALSE_POSITIVES)
 
 
 def _scx_ci_check_output(text: str) -> list[str]:
@@ -5355,8 +5679,12 @@ def _scx_ci_check_output(text: str) -> list[str]:
     Returns list of matching failure lines (empty = pass)."""
     failures = []
     for line in text.splitlines():
+        if not line or line.isspace():
+            continue
+        # ONE lower() PER LINE, SHARED BY THE FALSE-POSITIVE AND ICASE SCANS
+        lower = line.lower()
         # SKIP KNOWN FALSE POSITIVES
-        if any(fp.lower() in line.lower() for fp in SCX_CI_FALSE_POSITIVES):
+        if any(fp in lower for fp in _SCX_CI_FALSE_POSITIVES_LC):
             continue
         # EXACT CASE PATTERNS
         for pat in SCX_CI_FAIL_PATTERNS:
@@ -5365,7 +5693,6 @@ def _scx_ci_check_output(text: str) -> list[str]:
                 break
         else:
             # CASE-INSENSITIVE PATTERNS
-            lower = line.lower()
             for pat in SCX_CI_FAIL_ICASE:
                 if pat in lower:
                     failures.append(line.strip())
@@ -5570,7 +5897,7 @@ def cmd_bench_scx(args) -> int:
     log_info(f"PANDEMONIUMv{version} BENCH-SCX RESULTS")
     log_info("")
 
-    for nr_cpus in sorted(all_results.keys()):
+    for nr_cpus in all_results:
         cr = all_results[nr_cpus]
         log_info(f"  {nr_cpus}C:")
         for test_name in ["functional", "stress"]:
@@ -5599,7 +5926,7 @@ def cmd_bench_scx(args) -> int:
     with open(prom_path, "w") as f:
         f.write(f'# PANDEMONIUM bench-scx v{version}\n')
         f.write(f'# {datetime.now().isoformat()}\n')
-        for nr_cpus in sorted(all_results.keys()):
+        for nr_cpus in all_results:
             cr = all_results[nr_cpus]
             for test_name in ["functional", "stress"]:
                 r = cr.get(test_name, {})
@@ -5620,13 +5947,15 @@ def cmd_bench_scx(args) -> int:
 
 
 def main() -> int:
+    # NO PREFIX MATCHING: OPTIONS MUST BE SPELLED OUT IN FULL
     parser = argparse.ArgumentParser(
         description="PANDEMONIUM test orchestrator",
         formatter_class=argparse.RawDescriptionHelpFormatter,
+        allow_abbrev=False,
     )
     sub = parser.add_subparsers(dest="command")
 
-    bench = sub.add_parser("bench-scale",
+    bench = sub.add_parser("bench-scale", allow_abbrev=False,
                            help="Unified throughput + latency benchmark")
     bench.add_argument("--cmd", type=str, default=None,
                        help="Custom workload command (default: self-build)")
@@ -5661,8 +5990,10 @@ def main() -> int:
                             "test under load")
     bench.add_argument("--trace", action="store_true",
                        help="Enable bpf_printk trace capture during benchmark")
+    bench.add_argument("--skip-dmesg", action="store_true",
+                       help="Do not capture kernel messages")
 
-    trace_bench = sub.add_parser("bench-trace",
+    trace_bench = sub.add_parser("bench-trace", allow_abbrev=False,
                                   help="Crash-detection stress test with trace capture")
     trace_bench.add_argument("--iterations", type=int, default=1,
                              help="Full workload iterations per core count (default: 1)")
@@ -5670,7 +6001,7 @@ def main() -> int:
                              help="Comma-separated core counts "
                                   "(default: auto 2,4,8,...,max)")
 
-    contention_bench = sub.add_parser("bench-contention",
+    contention_bench = sub.add_parser("bench-contention", allow_abbrev=False,
                                       help="Contention stress test for v5.4.x adaptive features")
     contention_bench.add_argument("--iterations", type=int, default=1,
                                   help="Full workload iterations per core count (default: 1)")
@@ -5682,7 +6013,7 @@ def main() -> int:
                                        "sojourn-pressure, longrun-interactive, "
                                        "burst-recovery, mixed-storm")
 
-    sys_bench = sub.add_parser("bench-sys",
+    sys_bench = sub.add_parser("bench-sys", allow_abbrev=False,
                                help="Live system telemetry capture")
     sys_bench.add_argument("--scheduler", type=str, default="adaptive",
                            help="Scheduler to run: adaptive (default), "
@@ -5694,7 +6025,7 @@ def main() -> int:
                            help="Additional compositor process names "
                                 "(PANDEMONIUM modes only)")
 
-    pcpu_bench = sub.add_parser("bench-pcpu",
+    pcpu_bench = sub.add_parser("bench-pcpu", allow_abbrev=False,
                                 help="Per-CPU DSQ visibility stress test (v5.4.8)")
     pcpu_bench.add_argument("--iterations", type=int, default=1,
                             help="Iterations per core count (default: 1)")
@@ -5702,14 +6033,14 @@ def main() -> int:
                             help="Comma-separated core counts "
                                  "(default: auto 2,4,8,...,max)")
 
-    cs2_bench = sub.add_parser("bench-cs2",
+    cs2_bench = sub.add_parser("bench-cs2", allow_abbrev=False,
                                 help="Automated game workload diagnosis")
     cs2_bench.add_argument("--target", type=str, default="cs2",
                            help="Process name to trace and detect (default: cs2)")
     cs2_bench.add_argument("--duration", type=int, default=0,
                            help="Capture duration in seconds (default: 120)")
 
-    scx_bench = sub.add_parser("bench-scx",
+    scx_bench = sub.add_parser("bench-scx", allow_abbrev=False,
                                 help="scx CI compatibility test")
     scx_bench.add_argument("--duration", type=int, default=30,
                            help="Functional test duration in seconds (default: 30)")
@@ -5730,7 +6061,10 @@ def main() -> int:
                            if s.strip()]
 
     if args.command == "bench-scale":
-        return cmd_bench_scale(args)
+        try:
+            return cmd_bench_scale(args)
+        finally:
+            stop_priv_helper()
     if args.command == "bench-trace":
         return cmd_bench_trace(args)
     if args.command == "bench-contention":
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+PANDEMONIUM privileged helper.
+
+Started once under sudo by the test orchestrator; reads newline-delimited
+JSON requests on stdin and answers each with one JSON line on stdout, so a
+long sweep pays for a single sudo instead of one per privileged step.
+
+Requests:
+    {"op": "cpu_online", "cpus": [..], "val": 0|1, "stop_on_error": bool}
+        -> {"failed": cpu | null}
+    {"op": "dmesg_cursor"}              -> {"cursor": str | null}
+    {"op": "dmesg_count"}               -> {"count": int}
+    {"op": "dmesg_after", "cursor": str | null, "skip": int}
+        -> {"bytes": n} followed by n raw bytes of newline-terminated
+           kernel lines, repeated, then {"end": true} (with "error": str
+           if the read failed part way)
+    {"op": "exit"}
+
+A failing request answers {"error": str}; only a closed stdout ends the
+helper early.
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+
+# ONE BUFFERED BINARY WRITER FOR EVERYTHING: UNDER python -u sys.stdout.buffer
+# IS A RAW FileIO WHOSE write() MAY BE PARTIAL
+_OUT = os.fdopen(sys.stdout.fileno(), "wb", closefd=False)
+
+# KERNEL BYTES PER {"bytes": n} FRAME
+_FRAME_BYTES = 1 << 16
+
+
+def _send(obj) -> None:
+    _OUT.write(json.dumps(obj).encode() + b"\n")
+    _OUT.flush()
+
+
+def _send_frame(lines: list[bytes]) -> None:
+    data = b"".join(lines)
+    _OUT.write(b'{"bytes": %d}\n' % len(data))
+    _OUT.write(data)
+
+
+def _cpu_online(req: dict) -> dict:
+    value = "1" if req["val"] else "0"
+    failed = None
+    for cpu in req["cpus"]:
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/online", "w") as f:
+                f.write(value)
+        except OSError:
+            failed = cpu if failed is None else failed
+            if req.get("stop_on_error"):
+                break
+    return {"failed": failed}
+
+
+def _dmesg_cursor(req: dict) -> dict:
+    try:
+        r = subprocess.run(
+            ["journalctl", "--dmesg", "-n", "1", "--show-cursor",
+             "--no-pager", "-q"],
+            capture_output=True, text=True)
+    except FileNotFoundError:
+        return {"cursor": None}
+    if r.returncode == 0:
+        for line in reversed(r.stdout.splitlines()):
+            if line.startswith("-- cursor:"):
+                return {"cursor": line.split(":", 1)[1].strip()}
+    return {"cursor": None}
+
+
+def _dmesg_count(req: dict) -> dict:
+    # BYTES: KERNEL LINES ARE NOT GUARANTEED UTF-8
+    r = subprocess.run(["dmesg"], capture_output=True)
+    return {"count": r.stdout.count(b"\n") if r.returncode == 0 else 0}
+
+
+def _dmesg_after(req: dict) -> None:
+    # THE END RECORD IS ALWAYS SENT, SO THE ORCHESTRATOR CAN TELL A COMPLETE
+    # STREAM FROM ONE THAT FAILED PART WAY
+    error = None
+    try:
+        cursor = req.get("cursor")
+        if cursor is not None:
+            cmd = ["journalctl", "--dmesg", "--no-pager", "-q",
+                   "--after-cursor", cursor]
+        else:
+            cmd = ["dmesg"]
+        skip = req.get("skip", 0)
+        # KERNEL LINES ARE FORWARDED AS RAW BYTES IN LENGTH-PREFIXED FRAMES:
+        # NO DECODE OR JSON ROUND TRIP PER LINE ON EITHER SIDE OF THE PIPE
+        batch, size = [], 0
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL) as proc:
+            for i, raw in enumerate(proc.stdout):
+                if i < skip or raw.startswith(b"-- "):
+                    continue
+                if not raw.endswith(b"\n"):
+                    raw += b"\n"
+                batch.append(raw)
+                size += len(raw)
+                if size >= _FRAME_BYTES:
+                    _send_frame(batch)
+                    batch, size = [], 0
+        if batch:
+            _send_frame(batch)
+    except BrokenPipeError:
+        raise
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    _send({"end": True, "error": error} if error else {"end": True})
+
+
+OPS = {
+    "cpu_online": _cpu_online,
+    "dmesg_cursor": _dmesg_cursor,
+    "dmesg_count": _dmesg_count,
+}
+
+
+def main() -> int:
+    # Ctrl+C IS FOR THE ORCHESTRATOR; THE HELPER MUST OUTLIVE IT LONG ENOUGH
+    # TO BRING CPUS BACK ONLINE DURING CLEANUP. EOF ON STDIN ENDS IT
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for raw in sys.stdin:
+        try:
+            req = json.loads(raw)
+            op = req["op"]
+        except (ValueError, KeyError, TypeError):
+            _send({"error": "bad request"})
+            continue
+        if op == "exit":
+            break
+        try:
+            if op == "dmesg_after":
+                _dmesg_after(req)
+                continue
+            handler = OPS.get(op)
+            if handler is None:
+                _send({"error": f"unknown op {op}"})
+                continue
+            try:
+                reply = handler(req)
+            except Exception as e:
+                reply = {"error": str(e) or type(e).__name__}
+            _send(reply)
+        except BrokenPipeError:
+            # THE ORCHESTRATOR IS GONE; NOTHING LEFT TO ANSWER
+            break
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())